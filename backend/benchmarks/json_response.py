@@ -0,0 +1,107 @@
+"""
+Сериализация ответов: stdlib JSONResponse, Pydantic dump_json и ORJSONResponse.
+
+- stdlib: jsonable_encoder + json.dumps, прежний путь обработчиков ошибок
+  и маршрутов без response_model;
+- pydantic: TypeAdapter.dump_json, которым FastAPI сериализует маршруты
+  с response_model;
+- orjson: ORJSONResponse.render.
+
+Запуск из каталога backend:
+
+    python -m benchmarks.json_response
+"""
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from benchmarks import payloads
+from microservices.weather_service.handlers.responses import ORJSONResponse
+from microservices.weather_service.models.weatherHourly import (
+    HourlyWeatherResponse, hourly_weather_adapter, map_hour,
+)
+from microservices.weather_service.models.weatherDaily import (
+    DailyWeatherResponse, daily_weather_adapter, map_day,
+)
+
+_json_response = JSONResponse.__new__(JSONResponse)
+_orjson_response = ORJSONResponse.__new__(ORJSONResponse)
+
+
+def error_envelope() -> dict:
+    return {
+        "success": False,
+        "error": {
+            "code": 422,
+            "message": "Data validation error",
+            "details": [
+                {"field": f"body -> locations -> {i}", "message": "Field required", "type": "missing"}
+                for i in range(5)
+            ],
+            "path": "/weather/batch",
+        },
+    }
+
+
+def measure(fn, iterations: int) -> float:
+    """Среднее процессорное время одного вызова, мкс (лучшее из 5 прогонов)"""
+    best = float("inf")
+    for _ in range(5):
+        start = time.process_time()
+        for _ in range(iterations):
+            fn()
+        best = min(best, time.process_time() - start)
+    return best / iterations * 1e6
+
+
+def main() -> None:
+    hourly = [
+        map_hour(hour)
+        for hour in hourly_weather_adapter.validate_json(
+            payloads.as_bytes(payloads.hourly_forecast(12))
+        ).forecastHours
+    ]
+    daily = [
+        map_day(day)
+        for day in daily_weather_adapter.validate_json(
+            payloads.as_bytes(payloads.daily_forecast(7))
+        ).forecastDays
+    ]
+    hourly_adapter = TypeAdapter(List[HourlyWeatherResponse])
+    daily_adapter = TypeAdapter(List[DailyWeatherResponse])
+    envelope = error_envelope()
+
+    cases = [
+        (
+            "hourly-12",
+            lambda: _json_response.render(jsonable_encoder(hourly)),
+            lambda: hourly_adapter.dump_json(hourly),
+            lambda: _orjson_response.render(hourly),
+        ),
+        (
+            "daily-7",
+            lambda: _json_response.render(jsonable_encoder(daily)),
+            lambda: daily_adapter.dump_json(daily),
+            lambda: _orjson_response.render(daily),
+        ),
+        (
+            "error-422",
+            lambda: _json_response.render(envelope),
+            None,
+            lambda: _orjson_response.render(envelope),
+        ),
+    ]
+
+    print(f"{'payload':<12}{'stdlib, us':>12}{'pydantic, us':>14}{'orjson, us':>12}")
+    for name, stdlib, pydantic_json, orjson_json in cases:
+        stdlib_us = measure(stdlib, 2000)
+        pydantic_us = f"{measure(pydantic_json, 2000):>14.1f}" if pydantic_json else f"{'-':>14}"
+        orjson_us = measure(orjson_json, 2000)
+        print(f"{name:<12}{stdlib_us:>12.1f}{pydantic_us}{orjson_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
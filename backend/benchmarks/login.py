@@ -0,0 +1,148 @@
+"""
+Конкурентные /token, /login и /signup: Argon2 прямо в цикле событий
+(прежний вариант) против ограниченного пула потоков PasswordHasher.
+
+Пользователи хранятся в памяти, чтобы в цифры не попадала задержка
+MongoDB. Параллельно с пачкой входов идут запросы к / — по их задержке
+видно, блокирует ли хеширование остальные запросы воркера.
+
+Запуск из каталога backend:
+
+    python -m benchmarks.login
+"""
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+
+from microservices.auth_service.main import app
+from microservices.auth_service.models.user_model import UserInDB
+from microservices.auth_service.repository.user import user_repository
+from microservices.auth_service.services import auth
+from microservices.auth_service.services.hashing import PasswordHasher
+
+PASSWORD = "benchmark-password"
+
+
+class InlineHasher:
+    """Прежнее поведение: синхронный pwdlib внутри async-обработчика"""
+
+    def __init__(self, password_hash):
+        self.password_hash = password_hash
+
+    async def hash(self, password: str) -> str:
+        return self.password_hash.hash(password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return self.password_hash.verify(password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return self.password_hash.verify_and_update(password, hashed_password)
+
+
+def use_memory_repository() -> None:
+    users: dict[str, dict] = {}
+
+    async def get_user_by_username(username):
+        user = users.get(username)
+        return UserInDB(**user) if user else None
+
+    async def user_exists(username):
+        return username in users
+
+    async def email_exists(email):
+        return any(user["email"] == email for user in users.values())
+
+    async def create_user(user_data):
+        user_data["created_at"] = user_data["updated_at"] = datetime.utcnow()
+        users[user_data["username"]] = dict(user_data, id=user_data["username"])
+        return UserInDB(**users[user_data["username"]])
+
+    user_repository.get_user_by_username = get_user_by_username
+    user_repository.user_exists = user_exists
+    user_repository.email_exists = email_exists
+    user_repository.create_user = create_user
+
+    for i in range(8):
+        users[f"user{i}"] = {
+            "id": f"user{i}",
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "hashed_password": auth.password_hash.hash(PASSWORD),
+            "disabled": False,
+        }
+
+
+async def burst(client: httpx.AsyncClient, run: int, logins: int) -> int:
+    """Число ответов 503 (отказов пула)"""
+    requests = []
+    for i in range(logins):
+        requests.append(client.post("/token", data={"username": f"user{i}", "password": PASSWORD}))
+        requests.append(client.post("/login", json={"username": f"user{i}", "password": PASSWORD}))
+        requests.append(client.post("/signup", json={
+            "username": f"new{run}-{i}",
+            "email": f"new{run}-{i}@example.com",
+            "password": PASSWORD,
+        }))
+    responses = await asyncio.gather(*requests)
+    assert all(response.status_code in (200, 503) for response in responses)
+    return sum(response.status_code == 503 for response in responses)
+
+
+async def measure(label: str, hasher, run: int, logins: int) -> None:
+    auth.password_hasher = hasher
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies: list[float] = []
+        done = asyncio.Event()
+
+        async def ticker():
+            # Задержка считается от момента, когда запрос должен был уйти:
+            # так в нее попадает и время, пока цикл событий был занят
+            while not done.is_set():
+                due = time.perf_counter() + 0.005
+                await asyncio.sleep(0.005)
+                await client.get("/")
+                latencies.append(time.perf_counter() - due)
+
+        ticker_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        shed = await burst(client, run, logins)
+        elapsed = time.perf_counter() - start
+        done.set()
+        await ticker_task
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e3
+    worst = latencies[-1] * 1e3
+    operations = logins * 3
+    print(
+        f"{label:<12}{operations:>5}{shed:>6}{elapsed:>10.2f}{(operations - shed) / elapsed:>10.1f}"
+        f"{len(latencies):>8}{p50:>10.1f}{worst:>11.1f}"
+    )
+
+
+async def main(logins: int = 4) -> None:
+    use_memory_repository()
+
+    print(
+        f"{'hasher':<12}{'ops':>5}{'503':>6}{'total, s':>10}{'ok/s':>10}"
+        f"{'GET /':>8}{'p50, ms':>10}{'max, ms':>11}"
+    )
+    await measure("inline", InlineHasher(auth.password_hash), 0, logins)
+
+    # Очередь вмещает всю пачку: видно только влияние на цикл событий
+    pool = PasswordHasher(auth.password_hash, queue_limit=logins * 3)
+    await measure("pool", pool, 1, logins)
+    pool.shutdown()
+
+    # Настройки по умолчанию: лишнее сверх HASH_QUEUE_LIMIT получает 503
+    pool = PasswordHasher(auth.password_hash)
+    await measure("pool-default", pool, 2, logins)
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
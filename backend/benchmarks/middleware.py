@@ -0,0 +1,113 @@
+"""
+Стек RequestLoggingMiddleware + SecurityHeadersMiddleware каждого сервиса:
+прежняя реализация на BaseHTTPMiddleware против чистого ASGI.
+
+Запросы идут через httpx.ASGITransport без сети, поэтому цифры отражают
+накладные расходы самого стека. Маршруты: небольшой JSON и поток
+из 20 фрагментов (StreamingResponse).
+
+Запуск из каталога backend:
+
+    python -m benchmarks.middleware
+"""
+import asyncio
+import importlib
+import time
+from typing import Callable
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+SERVICES = ["auth_service", "user_service", "weather_service"]
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """Прежняя реализация из handlers/middleware.py"""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """Прежняя реализация из handlers/middleware.py"""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = "max-age=120; includeSubDomains"
+        return response
+
+
+def build_app(logging_middleware, security_middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    async def root():
+        return {"message": "Service is running", "version": "1.0.0"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(20):
+                yield b'{"index": %d}\n' % i
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    # Тот же порядок, что в main.py сервисов
+    app.add_middleware(logging_middleware)
+    app.add_middleware(security_middleware)
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> tuple[float, float, float]:
+    """Запросов в секунду, p50 и p99 задержки в мс"""
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get(path)
+
+        queue = iter(range(requests))
+
+        async def worker():
+            for _ in queue:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                assert response.headers["X-Frame-Options"] == "DENY"
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    return requests / elapsed, p50, p99
+
+
+async def main(requests: int = 5000, concurrency: int = 20) -> None:
+    print(f"{'service':<18}{'route':<9}{'stack':<8}{'req/s':>9}{'p50, ms':>10}{'p99, ms':>10}")
+    for service in SERVICES:
+        middleware = importlib.import_module(f"microservices.{service}.handlers.middleware")
+        stacks = [
+            ("before", build_app(LegacyRequestLoggingMiddleware, LegacySecurityHeadersMiddleware)),
+            ("after", build_app(middleware.RequestLoggingMiddleware, middleware.SecurityHeadersMiddleware)),
+        ]
+        for path in ("/", "/stream"):
+            for stack, app in stacks:
+                rps, p50, p99 = await run(app, path, requests, concurrency)
+                print(f"{service:<18}{path:<9}{stack:<8}{rps:>9.0f}{p50:>10.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Примеры ответов Google Weather API для бенчмарков.
+
+Структура повторяет реальные ответы, включая поля, которые сервис
+не использует.
+"""
+import json
+
+
+def _condition(text: str = "Partly cloudy") -> dict:
+    return {
+        "iconBaseUri": "https://maps.gstatic.com/weather/v1/partly_cloudy",
+        "description": {"text": text, "languageCode": "en"},
+        "type": "PARTLY_CLOUDY",
+    }
+
+
+def _precipitation(percent: int) -> dict:
+    return {
+        "probability": {"percent": percent, "type": "RAIN"},
+        "qpf": {"quantity": 0.1, "unit": "MILLIMETERS"},
+    }
+
+
+def _wind(speed: float) -> dict:
+    return {
+        "direction": {"degrees": 210, "cardinal": "SOUTH_SOUTHWEST"},
+        "speed": {"value": speed, "unit": "KILOMETERS_PER_HOUR"},
+        "gust": {"value": speed * 1.8, "unit": "KILOMETERS_PER_HOUR"},
+    }
+
+
+def current_conditions() -> dict:
+    return {
+        "currentTime": "2026-10-18T10:00:00.123456Z",
+        "timeZone": {"id": "Asia/Almaty"},
+        "isDaytime": True,
+        "weatherCondition": _condition(),
+        "temperature": {"degrees": 12.5, "unit": "CELSIUS"},
+        "feelsLikeTemperature": {"degrees": 11.1, "unit": "CELSIUS"},
+        "dewPoint": {"degrees": 4.2, "unit": "CELSIUS"},
+        "heatIndex": {"degrees": 12.5, "unit": "CELSIUS"},
+        "windChill": {"degrees": 11.1, "unit": "CELSIUS"},
+        "relativeHumidity": 57,
+        "uvIndex": 3,
+        "precipitation": _precipitation(10),
+        "thunderstormProbability": 0,
+        "airPressure": {"meanSeaLevelMillibars": 1015.3},
+        "wind": _wind(9.0),
+        "visibility": {"distance": 16, "unit": "KILOMETERS"},
+        "cloudCover": 40,
+    }
+
+
+def hourly_forecast(hours: int = 24) -> dict:
+    return {
+        "forecastHours": [
+            {
+                "interval": {
+                    "startTime": f"2026-10-18T{hour % 24:02d}:00:00Z",
+                    "endTime": f"2026-10-18T{(hour + 1) % 24:02d}:00:00Z",
+                },
+                "displayDateTime": {"year": 2026, "month": 10, "day": 18, "hours": hour % 24},
+                "isDaytime": 6 <= hour % 24 < 18,
+                "weatherCondition": _condition(),
+                "temperature": {"degrees": 8.0 + hour * 0.3, "unit": "CELSIUS"},
+                "feelsLikeTemperature": {"degrees": 7.0 + hour * 0.3, "unit": "CELSIUS"},
+                "dewPoint": {"degrees": 3.1, "unit": "CELSIUS"},
+                "relativeHumidity": 60,
+                "uvIndex": 1,
+                "precipitation": _precipitation(15),
+                "thunderstormProbability": 0,
+                "airPressure": {"meanSeaLevelMillibars": 1014.8},
+                "wind": _wind(7.5),
+                "visibility": {"distance": 16, "unit": "KILOMETERS"},
+                "cloudCover": 55,
+            }
+            for hour in range(hours)
+        ],
+        "timeZone": {"id": "Asia/Almaty"},
+    }
+
+
+def daily_forecast(days: int = 7) -> dict:
+    def part(text: str) -> dict:
+        return {
+            "interval": {"startTime": "2026-10-18T02:00:00Z", "endTime": "2026-10-18T14:00:00Z"},
+            "weatherCondition": _condition(text),
+            "relativeHumidity": 48,
+            "uvIndex": 4,
+            "precipitation": _precipitation(20),
+            "thunderstormProbability": 0,
+            "wind": _wind(11.0),
+            "cloudCover": 35,
+        }
+
+    return {
+        "forecastDays": [
+            {
+                "interval": {"startTime": "2026-10-18T02:00:00Z", "endTime": "2026-10-19T02:00:00Z"},
+                "displayDate": {"year": 2026, "month": 10, "day": 18 + day},
+                "daytimeForecast": part("Sunny"),
+                "nighttimeForecast": part("Clear"),
+                "maxTemperature": {"degrees": 16.0, "unit": "CELSIUS"},
+                "minTemperature": {"degrees": 4.0, "unit": "CELSIUS"},
+                "feelsLikeMaxTemperature": {"degrees": 15.0, "unit": "CELSIUS"},
+                "feelsLikeMinTemperature": {"degrees": 2.0, "unit": "CELSIUS"},
+                "sunEvents": {
+                    "sunriseTime": "2026-10-18T01:45:12.000Z",
+                    "sunsetTime": "2026-10-18T12:31:40.000Z",
+                },
+                "moonEvents": {"moonPhase": "WAXING_CRESCENT"},
+            }
+            for day in range(days)
+        ],
+        "timeZone": {"id": "Asia/Almaty"},
+    }
+
+
+def as_bytes(payload: dict) -> bytes:
+    return json.dumps(payload).encode()
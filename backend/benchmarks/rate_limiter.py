@@ -0,0 +1,98 @@
+"""
+Ограничение частоты: прежний RateLimitInfo (список отметок времени на
+клиента) против SlidingWindowRateLimiter.
+
+Сценарии:
+- churn — 100 000 разных клиентов по кругу, по 5 запросов каждый;
+- hot — 1 000 клиентов у самого лимита (по 100 запросов в окне).
+
+Для каждого: проверок в секунду, число хранимых клиентов и память
+состояния (tracemalloc).
+
+Запуск из каталога backend:
+
+    python -m benchmarks.rate_limiter
+"""
+import time
+import tracemalloc
+
+from microservices.weather_service.services.rate_limiter import SlidingWindowRateLimiter
+
+
+class LegacyRateLimitInfo:
+    """Прежняя реализация из models/rate_limit_model.py"""
+
+    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.requests: dict[str, list[float]] = {}
+
+    def is_allowed(self, client_id: str) -> tuple[bool, int]:
+        current_time = time.time()
+
+        if client_id not in self.requests:
+            self.requests[client_id] = []
+
+        self.requests[client_id] = [
+            req_time for req_time in self.requests[client_id]
+            if current_time - req_time < self.window_seconds
+        ]
+
+        if len(self.requests[client_id]) >= self.max_requests:
+            return False, 0
+
+        self.requests[client_id].append(current_time)
+        remaining = self.max_requests - len(self.requests[client_id])
+
+        return True, remaining
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+
+def run(make_limiter, clients: list[str], rounds: int) -> tuple[float, int, float]:
+    """Проверок в секунду, хранимых клиентов, МБ состояния"""
+    limiter = make_limiter()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for client in clients:
+            limiter.is_allowed(client)
+    elapsed = time.perf_counter() - start
+
+    # Память отдельным прогоном: tracemalloc сильно замедляет вызовы
+    limiter = make_limiter()
+    tracemalloc.start()
+    for _ in range(rounds):
+        for client in clients:
+            limiter.is_allowed(client)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(clients) * rounds / elapsed, len(limiter), memory / 2**20
+
+
+def main() -> None:
+    churn = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(100_000)]
+    hot = churn[:1_000]
+
+    cases = [
+        ("churn", churn, 5, 100_000),
+        ("churn-cap", churn, 5, 20_000),
+        ("hot", hot, 100, 100_000),
+    ]
+
+    print(f"{'case':<11}{'limiter':<9}{'checks/s':>12}{'clients':>10}{'state, MB':>11}")
+    for name, clients, rounds, max_clients in cases:
+        limiters = [
+            ("legacy", lambda: LegacyRateLimitInfo(max_requests=100, window_seconds=60)),
+            ("sliding", lambda: SlidingWindowRateLimiter(
+                max_requests=100, window_seconds=60, max_clients=max_clients
+            )),
+        ]
+        for label, make_limiter in limiters:
+            rate, tracked, memory = run(make_limiter, clients, rounds)
+            print(f"{name:<11}{label:<9}{rate:>12.0f}{tracked:>10}{memory:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
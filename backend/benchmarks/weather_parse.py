@@ -0,0 +1,106 @@
+"""
+CPU-стоимость разбора одного ответа Google Weather API.
+
+"before" повторяет прежний путь: response.json(), валидация входной модели,
+валидация *Response при маппинге, проверка response_model и выгрузка в dict
+для истории. "after" — текущий путь WeatherService.
+
+Запуск из каталога backend:
+
+    python -m benchmarks.weather_parse
+"""
+import json
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+from benchmarks import payloads
+from microservices.weather_service.models.weatherCurrent import (
+    CurrentWeather, CurrentWeatherResponse, current_weather_adapter, map_current,
+)
+from microservices.weather_service.models.weatherHourly import (
+    HourlyWeather, HourlyWeatherResponse, hourly_weather_adapter, map_hour,
+)
+from microservices.weather_service.models.weatherDaily import (
+    DailyWeather, DailyWeatherResponse, daily_weather_adapter, map_day,
+)
+
+current_response_adapter = TypeAdapter(CurrentWeatherResponse)
+hourly_response_adapter = TypeAdapter(List[HourlyWeatherResponse])
+daily_response_adapter = TypeAdapter(List[DailyWeatherResponse])
+
+
+def _validated(model_cls, constructed):
+    # Прежние map_* вызывали конструктор модели с валидацией
+    return model_cls(**constructed.__dict__)
+
+
+def current_before(raw: bytes) -> None:
+    weather = CurrentWeather(**json.loads(raw))
+    result = _validated(CurrentWeatherResponse, map_current(weather))
+    current_response_adapter.validate_python(result)
+    result.model_dump()
+
+
+def current_after(raw: bytes) -> None:
+    result = map_current(current_weather_adapter.validate_json(raw))
+    current_response_adapter.validate_python(result)
+    result.model_dump()
+
+
+def hourly_before(raw: bytes) -> None:
+    hourly = HourlyWeather(**json.loads(raw))
+    results = [_validated(HourlyWeatherResponse, map_hour(hour)) for hour in hourly.forecastHours[:12]]
+    hourly_response_adapter.validate_python(results)
+    [result.model_dump() for result in results]
+
+
+def hourly_after(raw: bytes) -> None:
+    hourly = hourly_weather_adapter.validate_json(raw)
+    results = [map_hour(hour) for hour in hourly.forecastHours[:12]]
+    hourly_response_adapter.validate_python(results)
+    [result.model_dump() for result in results]
+
+
+def daily_before(raw: bytes) -> None:
+    daily = DailyWeather(**json.loads(raw))
+    results = [_validated(DailyWeatherResponse, map_day(day)) for day in daily.forecastDays[:7]]
+    daily_response_adapter.validate_python(results)
+    [result.model_dump() for result in results]
+
+
+def daily_after(raw: bytes) -> None:
+    daily = daily_weather_adapter.validate_json(raw)
+    results = [map_day(day) for day in daily.forecastDays[:7]]
+    daily_response_adapter.validate_python(results)
+    [result.model_dump() for result in results]
+
+
+def measure(fn, raw: bytes, iterations: int) -> float:
+    """Среднее процессорное время одного вызова, мкс (лучшее из 5 прогонов)"""
+    best = float("inf")
+    for _ in range(5):
+        start = time.process_time()
+        for _ in range(iterations):
+            fn(raw)
+        best = min(best, time.process_time() - start)
+    return best / iterations * 1e6
+
+
+def main() -> None:
+    cases = [
+        ("current", payloads.as_bytes(payloads.current_conditions()), current_before, current_after, 5000),
+        ("hourly-24", payloads.as_bytes(payloads.hourly_forecast(24)), hourly_before, hourly_after, 1000),
+        ("daily-7", payloads.as_bytes(payloads.daily_forecast(7)), daily_before, daily_after, 1000),
+    ]
+
+    print(f"{'payload':<12}{'bytes':>8}{'before, us':>14}{'after, us':>12}{'speedup':>10}")
+    for name, raw, before, after, iterations in cases:
+        before_us = measure(before, raw, iterations)
+        after_us = measure(after, raw, iterations)
+        print(f"{name:<12}{len(raw):>8}{before_us:>14.1f}{after_us:>12.1f}{before_us / after_us:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -74,6 +74,9 @@ async def create_indexes():
     
     await db.weather.create_index([("city", 1), ("timestamp", -1)])
     await db.weather.create_index("timestamp", expireAfterSeconds=86400)  
+
+    await db.rate_limits.create_index("expires_at", expireAfterSeconds=0)
+    await db.login_failures.create_index("expires_at", expireAfterSeconds=0)
     print("Индексы MongoDB созданы")
 
 
@@ -0,0 +1,23 @@
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse на orjson: datetime и модели Pydantic сериализуются без
+    предварительного jsonable_encoder.
+
+    Для маршрутов с response_model FastAPI сам сериализует ответ через
+    Pydantic, поэтому этот класс используется для обработчиков ошибок и
+    маршрутов без модели ответа.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
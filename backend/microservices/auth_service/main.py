@@ -7,6 +7,7 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from microservices.auth_service.configs.db import close_mongodb_connection, connect_to_mongodb
+from microservices.auth_service.configs.logging_config import setup_logging, shutdown_logging
 from microservices.auth_service.handlers.exceptions import (
     general_exception_handler,
     http_exception_handler,
@@ -16,14 +17,19 @@ from microservices.auth_service.handlers.middleware import (
     RequestLoggingMiddleware,
     SecurityHeadersMiddleware,
 )
+from microservices.auth_service.handlers.responses import ORJSONResponse
 from microservices.auth_service.routes import logIn, logOut, signUp, token
+from microservices.auth_service.services.auth import password_hasher
 
 
 @asynccontextmanager
 async def lifespan(app):
+    setup_logging()
     await connect_to_mongodb()
     yield
+    password_hasher.shutdown()
     await close_mongodb_connection()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -59,6 +65,6 @@ app.include_router(logIn.router)
 app.include_router(logOut.router)
 
 
-@app.get("/")
+@app.get("/", response_class=ORJSONResponse)
 async def root():
     return {"service": "auth", "status": "ok"}
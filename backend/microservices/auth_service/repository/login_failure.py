@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from microservices.auth_service.configs.db import get_database
+
+
+class LoginFailureRepository:
+    """Общие для всех реплик счетчики неудачных входов"""
+
+    def __init__(self):
+        pass
+
+    def _get_collection(self):
+        db = get_database()
+        if db is None:
+            raise Exception("База данных не подключена")
+        return db.login_failures
+
+    async def record_failure(self, key: str, now: float, ttl_seconds: float) -> None:
+
+        collection = self._get_collection()
+        await collection.update_one(
+            {"_id": key},
+            {
+                "$inc": {"failures": 1},
+                "$max": {"last_failure": now},
+                "$set": {"expires_at": datetime.utcnow() + timedelta(seconds=ttl_seconds)},
+            },
+            upsert=True,
+        )
+
+    async def get_failures(self, keys: list[str]) -> dict[str, tuple[int, float]]:
+        """{ключ: (число неудач, время последней)} для ключей, по которым они были"""
+
+        collection = self._get_collection()
+        cursor = collection.find(
+            {"_id": {"$in": keys}},
+            {"failures": 1, "last_failure": 1},
+        )
+        return {
+            doc["_id"]: (doc["failures"], doc["last_failure"])
+            async for doc in cursor
+        }
+
+    async def reset(self, key: str) -> None:
+
+        collection = self._get_collection()
+        await collection.delete_one({"_id": key})
+
+
+login_failure_repository = LoginFailureRepository()
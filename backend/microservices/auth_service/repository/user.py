@@ -1,6 +1,7 @@
 from typing import Optional
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 from microservices.auth_service.configs.db import get_database
 from microservices.auth_service.models.user_model import User, UserInDB
@@ -18,16 +19,20 @@ class UserRepository:
         return db.users
     
     async def create_user(self, user_data: dict) -> UserInDB:
+        """
+        Один insert без предварительных проверок: занятые username и email
+        отсекают уникальные индексы (DuplicateKeyError, см. duplicate_key_field)
+        """
         collection = self._get_collection()
         
-        user_data["created_at"] = datetime.utcnow()
-        user_data["updated_at"] = datetime.utcnow()
+        now = datetime.utcnow()
+        user_data["created_at"] = now
+        user_data["updated_at"] = now
         
-        result = await collection.insert_one(user_data)
+        # insert_one дописывает _id в user_data: перечитывать документ не нужно
+        await collection.insert_one(user_data)
         
-        created_user = await collection.find_one({"_id": result.inserted_id})
-        
-        return UserInDB(**self._convert_mongo_document(created_user))
+        return UserInDB(**self._convert_mongo_document(dict(user_data)))
     
     async def get_user_by_username(self, username: str) -> Optional[UserInDB]:
         
@@ -106,4 +111,19 @@ class UserRepository:
         return doc
 
 
+def duplicate_key_field(error: DuplicateKeyError) -> Optional[str]:
+    """Поле уникального индекса, из-за которого не прошла вставка"""
+    details = error.details or {}
+    key_pattern = details.get("keyPattern") or details.get("keyValue")
+    if key_pattern:
+        return next(iter(key_pattern))
+    
+    # Старые версии MongoDB сообщают только имя индекса: "index: email_1 dup key"
+    message = details.get("errmsg") or str(error)
+    for field in ("username", "email"):
+        if f"index: {field}_1" in message:
+            return field
+    return None
+
+
 user_repository = UserRepository()
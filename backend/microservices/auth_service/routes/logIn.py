@@ -1,14 +1,14 @@
 from datetime import timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 
 from microservices.auth_service.configs.auth_config import ACCESS_TOKEN_EXPIRE_MINUTES
 from microservices.auth_service.models.token_model import Token
 from microservices.auth_service.models.user_model import User
-from microservices.auth_service.services.auth import authenticate_user, create_access_token
+from microservices.auth_service.services.auth import authenticate_user, create_access_token, get_client_ip
 
 router = APIRouter(tags=["authentication"])
 
@@ -27,9 +27,9 @@ class LoginResponse(BaseModel):
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(request: LoginRequest) -> LoginResponse:
+async def login(request: LoginRequest, http_request: Request) -> LoginResponse:
     
-    user = await authenticate_user(request.username, request.password)
+    user = await authenticate_user(request.username, request.password, get_client_ip(http_request))
     
     if not user:
         raise HTTPException(
@@ -66,9 +66,10 @@ async def login(request: LoginRequest) -> LoginResponse:
 @router.post("/login/form", response_model=Token)
 async def login_form(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    http_request: Request,
 ) -> Token:
     
-    user = await authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password, get_client_ip(http_request))
     
     if not user:
         raise HTTPException(
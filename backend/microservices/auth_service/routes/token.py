@@ -1,12 +1,15 @@
+import logging
 from datetime import timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
 from microservices.auth_service.configs.auth_config import ACCESS_TOKEN_EXPIRE_MINUTES
 from microservices.auth_service.models.token_model import Token
-from microservices.auth_service.services.auth import authenticate_user, create_access_token
+from microservices.auth_service.services.auth import authenticate_user, create_access_token, get_client_ip
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["authentication"])
 
@@ -14,22 +17,22 @@ router = APIRouter(tags=["authentication"])
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    http_request: Request,
 ) -> Token:
     
-    user = await authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password, get_client_ip(http_request))
     if not user:
         raise HTTPException(
             status_code=401, 
             detail="Неверное имя пользователя или пароль"
         )
     
-    print(f"[DEBUG] Login for user: {user.username}")
-    print(f"[DEBUG] Requested scopes: {form_data.scopes}")
-    print(f"[DEBUG] Scopes type: {type(form_data.scopes)}")
-    
     scopes = form_data.scopes if form_data.scopes else ["me", "weather"]
     scope_str = " ".join(scopes)
-    print(f"[DEBUG] Final scope string: '{scope_str}'")
+    logger.debug(
+        "Login for user: %s requested scopes: %s final scope: %s",
+        user.username, form_data.scopes, scope_str,
+    )
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -1,12 +1,13 @@
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, Security, status
+from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import SecurityScopes
 from jwt.exceptions import InvalidTokenError
-from pwdlib import PasswordHash
 from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
 
 from microservices.auth_service.configs.auth_config import (
     SECRET_KEY, 
@@ -16,56 +17,90 @@ from microservices.auth_service.configs.auth_config import (
 )
 from microservices.auth_service.models.user_model import User, UserInDB
 from microservices.auth_service.models.token_model import Token, TokenData
-from microservices.auth_service.repository.user import user_repository
+from microservices.auth_service.repository.user import duplicate_key_field, user_repository
+from microservices.auth_service.services.login_guard import login_guard
+from microservices.auth_service.services.hashing import PasswordHasher, create_password_hash, password_rehashes
 
+logger = logging.getLogger(__name__)
 
-password_hash = PasswordHash.recommended()
+password_hash = create_password_hash()
+password_hasher = PasswordHasher(password_hash)
+_dummy_hash: str | None = None
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return password_hash.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    return password_hash.hash(password)
+def get_client_ip(request: Request) -> str | None:
+    """
+    Адрес клиента. За прокси это адрес из X-Forwarded-For, только если
+    uvicorn запущен с --proxy-headers и прокси указан в --forwarded-allow-ips
+    """
+    return request.client.host if request.client else None
 
 
 async def get_user(username: str) -> UserInDB | None:
     return await user_repository.get_user_by_username(username)
 
 
-async def authenticate_user(username: str, password: str) -> UserInDB | bool:
+async def _get_dummy_hash() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await password_hasher.hash("dummy-password")
+    return _dummy_hash
+
+
+async def authenticate_user(username: str, password: str, client_ip: str | None = None) -> UserInDB | bool:
+    await login_guard.check(username, client_ip)
+    
     user = await get_user(username)
     if not user:
+        # Та же работа Argon2, что и для существующего имени: по времени
+        # ответа нельзя понять, есть ли такой пользователь
+        await password_hasher.verify(password, await _get_dummy_hash())
+        await login_guard.record_failure(username, client_ip)
         return False
-    if not verify_password(password, user.hashed_password):
+    
+    valid, updated_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
+        await login_guard.record_failure(username, client_ip)
         return False
+    
+    await login_guard.record_success(username)
+    
+    if updated_hash is not None:
+        # Хеш с прежними параметрами Argon2: пересчитываем без сброса пароля
+        try:
+            await user_repository.update_user(user.username, {"hashed_password": updated_hash})
+            user.hashed_password = updated_hash
+            password_rehashes.inc()
+        except Exception as e:
+            logger.warning("Password rehash failed for %s: %s", user.username, e)
+    
     return user
 
 
-async def create_user(username: str, email: str, password: str, full_name: str = None) -> UserInDB:
+DUPLICATE_USER_MESSAGES = {
+    "username": "Пользователь с таким именем уже существует",
+    "email": "Email уже используется",
+}
 
-    if await user_repository.user_exists(username):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Пользователь с таким именем уже существует"
-        )
-    
-    if await user_repository.email_exists(email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email уже используется"
-        )
+
+async def create_user(username: str, email: str, password: str, full_name: str = None) -> UserInDB:
     
     user_data = {
         "username": username,
         "email": email,
-        "hashed_password": get_password_hash(password),
+        "hashed_password": await password_hasher.hash(password),
         "full_name": full_name,
         "disabled": False
     }
     
-    return await user_repository.create_user(user_data)
+    try:
+        return await user_repository.create_user(user_data)
+    except DuplicateKeyError as e:
+        field = duplicate_key_field(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=DUPLICATE_USER_MESSAGES.get(field, "Пользователь уже существует")
+        )
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -103,10 +138,10 @@ async def get_current_user(
         scope: str = payload.get("scope", "")
         token_scopes = scope.split(" ") if scope else []
         
-        print(f"[DEBUG] Token decoded for user: {username}")
-        print(f"[DEBUG] Token scope string: '{scope}'")
-        print(f"[DEBUG] Token scopes list: {token_scopes}")
-        print(f"[DEBUG] Required scopes: {security_scopes.scopes}")
+        logger.debug(
+            "Token decoded for user: %s scopes: %s required: %s",
+            username, token_scopes, security_scopes.scopes,
+        )
         
         token_data = TokenData(scopes=token_scopes, username=username)
     except (InvalidTokenError, ValidationError):
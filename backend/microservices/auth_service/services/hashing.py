@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from prometheus_client import Counter, Gauge
+
+load_dotenv()
+
+# argon2-cffi отпускает GIL на время хеширования, поэтому потоки
+# считают параллельно и не блокируют цикл событий
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+# Сколько операций может ждать свободного потока сверх HASH_WORKERS
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", str(HASH_WORKERS * 4)))
+HASH_RETRY_AFTER = os.getenv("HASH_RETRY_AFTER", "1")
+
+# Параметры Argon2 для новых хешей. По умолчанию — PasswordHash.recommended(),
+# подобрать под сервер: python -m microservices.auth_service.services.hashing
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+# Границы калибровки: время одного хеша и память в KiB
+ARGON2_TARGET_MS = float(os.getenv("ARGON2_TARGET_MS", "250"))
+ARGON2_MIN_MEMORY_COST = int(os.getenv("ARGON2_MIN_MEMORY_COST", "19456"))
+ARGON2_MAX_MEMORY_COST = int(os.getenv("ARGON2_MAX_MEMORY_COST", "65536"))
+
+T = TypeVar("T")
+
+hash_operations = Counter(
+    "auth_password_hash_operations_total",
+    "Операции Argon2 в пуле",
+    ["operation", "result"],
+)
+hash_in_flight = Gauge(
+    "auth_password_hash_in_flight",
+    "Операции Argon2 в работе и в очереди",
+)
+password_rehashes = Counter(
+    "auth_password_rehashes_total",
+    "Хеши паролей, пересчитанные при входе под текущие параметры",
+)
+
+
+def create_password_hash(
+    time_cost: int = ARGON2_TIME_COST,
+    memory_cost: int = ARGON2_MEMORY_COST,
+    parallelism: int = ARGON2_PARALLELISM,
+) -> PasswordHash:
+    return PasswordHash((
+        Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism),
+    ))
+
+
+def _measure_ms(hasher: Argon2Hasher, rounds: int = 3) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_argon2(
+    target_ms: float = ARGON2_TARGET_MS,
+    min_memory_cost: int = ARGON2_MIN_MEMORY_COST,
+    max_memory_cost: int = ARGON2_MAX_MEMORY_COST,
+    parallelism: int = ARGON2_PARALLELISM,
+) -> dict:
+    """
+    Подобрать time_cost и memory_cost, при которых один хеш занимает не
+    больше target_ms на этом сервере.
+
+    Память важнее для стойкости к перебору на GPU, поэтому сначала она
+    уменьшается вдвое от max_memory_cost (при time_cost=1), пока хеш не
+    уложится в бюджет, а оставшийся запас добирается числом проходов.
+    """
+    memory_cost = max_memory_cost
+    elapsed = _measure_ms(Argon2Hasher(time_cost=1, memory_cost=memory_cost, parallelism=parallelism))
+    while elapsed > target_ms and memory_cost // 2 >= min_memory_cost:
+        memory_cost //= 2
+        elapsed = _measure_ms(Argon2Hasher(time_cost=1, memory_cost=memory_cost, parallelism=parallelism))
+
+    time_cost = 1
+    while True:
+        candidate = _measure_ms(
+            Argon2Hasher(time_cost=time_cost + 1, memory_cost=memory_cost, parallelism=parallelism)
+        )
+        if candidate > target_ms:
+            break
+        time_cost += 1
+        elapsed = candidate
+
+    return {
+        "time_cost": time_cost,
+        "memory_cost": memory_cost,
+        "parallelism": parallelism,
+        "elapsed_ms": round(elapsed, 1),
+    }
+
+
+class PasswordHasher:
+    """
+    Argon2 в отдельном ограниченном пуле потоков.
+
+    Если в работе и в очереди уже workers + queue_limit операций, новая
+    сразу получает 503: лучше быстро отказать, чем держать запрос в
+    очереди дольше, чем клиент готов ждать.
+    """
+
+    def __init__(
+        self,
+        password_hash: PasswordHash,
+        workers: int = HASH_WORKERS,
+        queue_limit: int = HASH_QUEUE_LIMIT,
+    ):
+        self.password_hash = password_hash
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_limit)
+        self.in_flight = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="argon2",
+            )
+        return self._executor
+
+    async def _run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        if self.in_flight >= self.capacity:
+            hash_operations.labels(operation=operation, result="shed").inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервис перегружен, повторите попытку позже",
+                headers={"Retry-After": HASH_RETRY_AFTER},
+            )
+
+        self.in_flight += 1
+        hash_in_flight.inc()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+            hash_in_flight.dec()
+
+        hash_operations.labels(operation=operation, result="ok").inc()
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.password_hash.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", self.password_hash.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Проверка пароля; если хеш с устаревшими параметрами — еще и новый хеш"""
+        return await self._run(
+            "verify", self.password_hash.verify_and_update, password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Подбор параметров Argon2 под бюджет времени входа")
+    parser.add_argument("--target-ms", type=float, default=ARGON2_TARGET_MS)
+    parser.add_argument("--min-memory", type=int, default=ARGON2_MIN_MEMORY_COST)
+    parser.add_argument("--max-memory", type=int, default=ARGON2_MAX_MEMORY_COST)
+    parser.add_argument("--parallelism", type=int, default=ARGON2_PARALLELISM)
+    args = parser.parse_args()
+
+    params = calibrate_argon2(args.target_ms, args.min_memory, args.max_memory, args.parallelism)
+    print(f"# Один хеш: {params['elapsed_ms']} мс (бюджет {args.target_ms} мс)")
+    print(f"ARGON2_TIME_COST={params['time_cost']}")
+    print(f"ARGON2_MEMORY_COST={params['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={params['parallelism']}")
@@ -0,0 +1,171 @@
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from prometheus_client import Counter
+
+from microservices.auth_service.repository.login_failure import login_failure_repository
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# memory — счетчики в процессе, mongo — общие для всех реплик
+LOGIN_GUARD_BACKEND = os.getenv("LOGIN_GUARD_BACKEND", "memory").lower()
+# Неудачных попыток без задержки: на имя пользователя и на IP
+LOGIN_USER_FREE_ATTEMPTS = int(os.getenv("LOGIN_USER_FREE_ATTEMPTS", "5"))
+LOGIN_IP_FREE_ATTEMPTS = int(os.getenv("LOGIN_IP_FREE_ATTEMPTS", "20"))
+# Счетчик по IP включать, только если адрес клиента настоящий: uvicorn
+# с --proxy-headers и прокси в FORWARDED_ALLOW_IPS. Иначе все клиенты
+# видны с адреса прокси (Render, ingress Swarm) и один перебор
+# заблокирует вход всем
+LOGIN_GUARD_IP_ENABLED = os.getenv("LOGIN_GUARD_IP_ENABLED", "false").lower() == "true"
+# Задержка после каждой следующей неудачи удваивается от base до max секунд
+LOGIN_BACKOFF_BASE = float(os.getenv("LOGIN_BACKOFF_BASE", "1"))
+LOGIN_BACKOFF_MAX = float(os.getenv("LOGIN_BACKOFF_MAX", "900"))
+# Через сколько секунд без неудач счетчик забывается
+LOGIN_FAILURE_RESET = float(os.getenv("LOGIN_FAILURE_RESET", "900"))
+LOGIN_GUARD_MAX_KEYS = int(os.getenv("LOGIN_GUARD_MAX_KEYS", "100000"))
+
+login_guard_events = Counter(
+    "auth_login_guard_events_total",
+    "Неудачные входы и отказы до проверки пароля",
+    ["event"],
+)
+
+
+class _Failures:
+    __slots__ = ("count", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.last = 0.0
+
+
+class LoginGuard:
+    """
+    Экспоненциальная задержка входа после неудачных попыток — отдельно
+    по имени пользователя и, если включено, по IP.
+
+    Проверка выполняется до поиска пользователя и Argon2, поэтому отказ
+    почти ничего не стоит. Неудачи считаются и для несуществующих имен,
+    а отказ одинаков для всех, так что по нему нельзя узнать, есть ли
+    такой пользователь.
+    """
+
+    def __init__(
+        self,
+        user_free_attempts: int = LOGIN_USER_FREE_ATTEMPTS,
+        ip_free_attempts: int = LOGIN_IP_FREE_ATTEMPTS,
+        backoff_base: float = LOGIN_BACKOFF_BASE,
+        backoff_max: float = LOGIN_BACKOFF_MAX,
+        reset_seconds: float = LOGIN_FAILURE_RESET,
+        max_keys: int = LOGIN_GUARD_MAX_KEYS,
+        shared: bool = LOGIN_GUARD_BACKEND == "mongo",
+        ip_enabled: bool = LOGIN_GUARD_IP_ENABLED,
+    ):
+        self.user_free_attempts = user_free_attempts
+        self.ip_free_attempts = ip_free_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Счетчик не должен забыться раньше, чем закончится задержка
+        self.reset_seconds = max(reset_seconds, backoff_max)
+        self.max_keys = max_keys
+        self.shared = shared
+        self.ip_enabled = ip_enabled
+        self._failures: OrderedDict[str, _Failures] = OrderedDict()
+        self._next_sweep = 0.0
+
+    def _keys(self, username: str, client_ip: str | None) -> dict[str, int]:
+        keys = {f"user:{username}": self.user_free_attempts}
+        if client_ip and self.ip_enabled:
+            keys[f"ip:{client_ip}"] = self.ip_free_attempts
+        return keys
+
+    def _blocked_for(self, count: int, last: float, free_attempts: int, now: float) -> float:
+        if count < free_attempts:
+            return 0.0
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (count - free_attempts))
+        return max(0.0, last + backoff - now)
+
+    def _sweep(self, now: float) -> None:
+        # Словарь упорядочен по времени последней неудачи
+        while self._failures:
+            key, failures = next(iter(self._failures.items()))
+            if failures.last + self.reset_seconds > now:
+                break
+            del self._failures[key]
+        self._next_sweep = now + self.reset_seconds / 10
+
+    async def check(self, username: str, client_ip: str | None = None) -> None:
+        """HTTP 429, если для имени или IP еще действует задержка"""
+        now = time.time()
+        keys = self._keys(username, client_ip)
+
+        counts = {
+            key: (failures.count, failures.last)
+            for key in keys
+            if (failures := self._failures.get(key)) is not None
+        }
+        if self.shared:
+            try:
+                counts.update(await login_failure_repository.get_failures(list(keys)))
+            except Exception as e:
+                logger.warning("Login guard store unavailable: %s", e)
+
+        blocked_for = max(
+            (
+                self._blocked_for(count, last, keys[key], now)
+                for key, (count, last) in counts.items()
+                if now - last < self.reset_seconds
+            ),
+            default=0.0,
+        )
+        if blocked_for > 0:
+            login_guard_events.labels(event="rejected").inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Слишком много неудачных попыток входа, повторите позже",
+                headers={"Retry-After": str(math.ceil(blocked_for))},
+            )
+
+    async def record_failure(self, username: str, client_ip: str | None = None) -> None:
+        now = time.time()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        login_guard_events.labels(event="failure").inc()
+        for key in self._keys(username, client_ip):
+            failures = self._failures.get(key)
+            if failures is None:
+                failures = self._failures[key] = _Failures()
+                if len(self._failures) > self.max_keys:
+                    self._failures.popitem(last=False)
+            elif now - failures.last >= self.reset_seconds:
+                failures.count = 0
+            failures.count += 1
+            failures.last = now
+            self._failures.move_to_end(key)
+
+            if self.shared:
+                try:
+                    await login_failure_repository.record_failure(key, now, self.reset_seconds)
+                except Exception as e:
+                    logger.warning("Login guard store unavailable: %s", e)
+
+    async def record_success(self, username: str) -> None:
+        """Успешный вход сбрасывает счетчик имени; счетчик IP остается"""
+        key = f"user:{username}"
+        self._failures.pop(key, None)
+        if self.shared:
+            try:
+                await login_failure_repository.reset(key)
+            except Exception as e:
+                logger.warning("Login guard store unavailable: %s", e)
+
+
+login_guard = LoginGuard()
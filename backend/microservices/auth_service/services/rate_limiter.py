@@ -0,0 +1,286 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Hashable, Protocol
+
+from dotenv import load_dotenv
+
+from microservices.auth_service.repository.rate_limit import rate_limit_repository
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# mongo — общий лимит для всех реплик, memory — лимит на процесс
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "mongo").lower()
+# Сколько запросов реплика берет из общего счетчика за одно обращение к БД
+RATE_LIMIT_LEASE_SIZE = int(os.getenv("RATE_LIMIT_LEASE_SIZE", "10"))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "100000"))
+# Сколько секунд ждать хранилище; после ошибки столько секунд к нему не
+# обращаться и сразу считать лимит на процесс
+RATE_LIMIT_BACKEND_TIMEOUT = float(os.getenv("RATE_LIMIT_BACKEND_TIMEOUT", "0.2"))
+RATE_LIMIT_BACKEND_RETRY = float(os.getenv("RATE_LIMIT_BACKEND_RETRY", "5"))
+
+
+def _evict_idle(clients: OrderedDict, keep_from: int) -> None:
+    """
+    Удалить с начала словаря клиентов, последнее окно которых раньше keep_from.
+    Словарь упорядочен по последнему обращению, поэтому дальше первого
+    активного клиента идти не нужно.
+    """
+    while clients:
+        client_id, state = next(iter(clients.items()))
+        if state.index >= keep_from:
+            break
+        del clients[client_id]
+
+
+class _Window:
+    __slots__ = ("index", "previous", "current")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.previous = 0
+        self.current = 0
+
+
+class SlidingWindowRateLimiter:
+    """
+    Ограничение частоты запросов скользящим окном из двух счетчиков.
+
+    Для клиента хранятся номер текущего окна и число запросов в нем и в
+    предыдущем. Число запросов за последние window_seconds оценивается как
+    previous * (доля предыдущего окна, попавшая в интервал) + current,
+    поэтому проверка стоит O(1) и не зависит от max_requests.
+
+    Клиенты упорядочены по последнему обращению: раз в окно с начала
+    словаря удаляются те, чьи счетчики уже обнулились, а при превышении
+    max_clients вытесняются самые давние.
+    """
+
+    def __init__(
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        max_clients: int = RATE_LIMIT_MAX_CLIENTS,
+    ):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.max_clients = max_clients
+        self._clients: OrderedDict[Hashable, _Window] = OrderedDict()
+        self._next_sweep = 0
+
+    def is_allowed(self, client_id: Hashable, cost: int = 1, force: bool = False) -> tuple[bool, int]:
+        """
+        Списать cost запросов; возвращает (разрешено, осталось в окне).
+        С force стоимость списывается и сверх лимита (доплата за уже
+        выполненную работу)
+        """
+        now = time.monotonic()
+        index, offset = divmod(now, self.window_seconds)
+        index = int(index)
+
+        if index >= self._next_sweep:
+            self._sweep(index)
+
+        window = self._clients.get(client_id)
+        if window is None:
+            window = self._clients[client_id] = _Window(index)
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client_id)
+            if window.index != index:
+                window.previous = window.current if window.index == index - 1 else 0
+                window.current = 0
+                window.index = index
+
+        weight = 1.0 - offset / self.window_seconds
+        used = window.previous * weight + window.current
+
+        if used + cost > self.max_requests and not force:
+            return False, 0
+
+        window.current += cost
+        return True, max(0, int(self.max_requests - used - cost))
+
+    def reset_after(self) -> float:
+        """Секунд до начала следующего окна"""
+        return self.window_seconds - time.monotonic() % self.window_seconds
+
+    def _sweep(self, index: int) -> None:
+        # Клиенты без запросов в текущем и предыдущем окне ни на что не влияют
+        _evict_idle(self._clients, index - 1)
+        self._next_sweep = index + 1
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+class RateLimitBackend(Protocol):
+    """Хранилище общих счетчиков: атомарно прибавляет amount и возвращает сумму"""
+
+    async def reserve(self, key: str, amount: int, expires_at: datetime) -> int:
+        ...
+
+
+class MemoryRateLimitBackend:
+    """Счетчики в памяти процесса: для тестов и запуска одной репликой"""
+
+    def __init__(self):
+        self._counters: dict[str, list] = {}
+        self._next_sweep = datetime.max
+
+    async def reserve(self, key: str, amount: int, expires_at: datetime) -> int:
+        # Все счетчики окна истекают вместе, поэтому полный проход
+        # бывает не чаще раза за окно, а не на каждый новый ключ
+        now = datetime.utcnow()
+        if now >= self._next_sweep:
+            self._counters = {
+                key: counter for key, counter in self._counters.items()
+                if counter[1] > now
+            }
+            self._next_sweep = min(
+                (counter[1] for counter in self._counters.values()),
+                default=datetime.max,
+            )
+
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [0, expires_at]
+            self._next_sweep = min(self._next_sweep, expires_at)
+        counter[0] += amount
+        return counter[0]
+
+
+class _Lease:
+    __slots__ = ("index", "tokens", "shared", "exhausted")
+
+    def __init__(self, index: int):
+        self.index = index
+        # Запросы, уже списанные с общего счетчика, но еще не потраченные
+        self.tokens = 0
+        # Значение общего счетчика при последнем обращении к хранилищу
+        self.shared = 0
+        self.exhausted = False
+
+
+class ClusterRateLimiter:
+    """
+    Общий для всех реплик лимит в фиксированных окнах по часам системы.
+
+    Реплика не ходит в хранилище на каждый запрос: она берет у общего
+    счетчика сразу lease_size запросов и тратит их локально. Неистраченный
+    остаток сгорает с окончанием окна, поэтому лимит может быть недобран
+    не больше чем на (реплик - 1) * lease_size, но не превышен.
+
+    Если хранилище недоступно или не ответило за backend_timeout,
+    действует лимит на процесс, и следующие backend_retry секунд
+    хранилище не опрашивается, чтобы запросы не ждали его таймаутов.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        lease_size: int = RATE_LIMIT_LEASE_SIZE,
+        max_clients: int = RATE_LIMIT_MAX_CLIENTS,
+        name: str = "default",
+        backend_timeout: float = RATE_LIMIT_BACKEND_TIMEOUT,
+        backend_retry: float = RATE_LIMIT_BACKEND_RETRY,
+    ):
+        self.backend = backend
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.lease_size = max(1, lease_size)
+        self.max_clients = max_clients
+        self.name = name
+        self.backend_timeout = backend_timeout
+        self.backend_retry = backend_retry
+        self._backend_retry_at = 0.0
+        self._leases: OrderedDict[Hashable, _Lease] = OrderedDict()
+        self._next_sweep = 0
+        self._fallback = SlidingWindowRateLimiter(max_requests, window_seconds, max_clients)
+
+    async def is_allowed(self, client_id: Hashable, cost: int = 1, force: bool = False) -> tuple[bool, int]:
+        """Как SlidingWindowRateLimiter.is_allowed, но по общему счетчику"""
+        index = int(time.time() // self.window_seconds)
+
+        if index >= self._next_sweep:
+            _evict_idle(self._leases, index)
+            self._next_sweep = index + 1
+
+        lease = self._leases.get(client_id)
+        if lease is None or lease.index != index:
+            lease = self._leases[client_id] = _Lease(index)
+            if len(self._leases) > self.max_clients:
+                self._leases.popitem(last=False)
+        self._leases.move_to_end(client_id)
+
+        if lease.tokens < cost and not lease.exhausted:
+            if time.monotonic() < self._backend_retry_at:
+                return self._fallback.is_allowed(client_id, cost, force)
+
+            amount = max(cost - lease.tokens, self.lease_size)
+            expires_at = datetime.utcnow() + timedelta(
+                seconds=(index + 1) * self.window_seconds - time.time()
+            )
+            try:
+                shared = await asyncio.wait_for(
+                    self.backend.reserve(f"{self.name}:{client_id}:{index}", amount, expires_at),
+                    self.backend_timeout,
+                )
+            except Exception as e:
+                logger.warning("Rate limit backend unavailable: %r", e)
+                self._backend_retry_at = time.monotonic() + self.backend_retry
+                return self._fallback.is_allowed(client_id, cost, force)
+
+            # Сверх лимита счетчик мог уйти из-за других реплик: берем только остаток
+            lease.tokens += max(0, min(amount, self.max_requests - (shared - amount)))
+            lease.shared = max(lease.shared, shared)
+            lease.exhausted = shared >= self.max_requests
+
+        if lease.tokens < cost and not force:
+            return False, 0
+
+        # С force остаток может уйти в минус: долг покроет следующая аренда
+        lease.tokens -= cost
+        return True, max(0, max(0, self.max_requests - lease.shared) + lease.tokens)
+
+    def refund(self, client_id: Hashable, amount: int) -> None:
+        """
+        Вернуть amount запросов, списанных в текущем окне. Они возвращаются
+        в аренду этой реплики: в общем счетчике остаются занятыми
+        """
+        lease = self._leases.get(client_id)
+        if lease is not None and lease.index == int(time.time() // self.window_seconds):
+            lease.tokens += amount
+
+    def reset_after(self) -> float:
+        """Секунд до начала следующего окна"""
+        return self.window_seconds - time.time() % self.window_seconds
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+
+def create_rate_limiter(
+    max_requests: int, 
+    window_seconds: int, 
+    name: str = "default",
+) -> ClusterRateLimiter:
+    """Лимитер с хранилищем из RATE_LIMIT_BACKEND"""
+    if RATE_LIMIT_BACKEND == "memory":
+        backend = MemoryRateLimitBackend()
+    else:
+        backend = rate_limit_repository
+    return ClusterRateLimiter(
+        backend,
+        max_requests=max_requests,
+        window_seconds=window_seconds,
+        name=name,
+    )
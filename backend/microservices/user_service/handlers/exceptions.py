@@ -1,16 +1,17 @@
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
 
+from microservices.user_service.handlers.responses import ORJSONResponse
+
 logger = logging.getLogger(__name__)
 
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-    logger.warning(f"HTTP {exc.status_code}: {exc.detail} - {request.url}")
+    logger.warning("HTTP %s: %s - %s", exc.status_code, exc.detail, request.url)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -20,11 +21,12 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
                 "path": str(request.url.path)
             }
         },
+        headers=getattr(exc, "headers", None),
     )
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logger.warning(f"Validation error: {exc.errors()} - {request.url}")
+    logger.warning("Validation error: %s - %s", exc.errors(), request.url)
     
     errors = []
     for error in exc.errors():
@@ -35,7 +37,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "type": error["type"]
         })
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
@@ -50,9 +52,9 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 
 async def general_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
@@ -89,9 +91,9 @@ class WeatherServiceException(WeatherAPIException):
 
 
 async def weather_api_exception_handler(request: Request, exc: WeatherAPIException):
-    logger.warning(f"Weather API exception: {exc.message} - {request.url}")
+    logger.warning("Weather API exception: %s - %s", exc.message, request.url)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
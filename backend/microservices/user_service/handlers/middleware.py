@@ -1,74 +1,216 @@
+import os
 import time
 import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from microservices.user_service.models.rate_limit_model import RateLimitInfo
+import jwt
+from dotenv import load_dotenv
+from jwt.exceptions import InvalidTokenError
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from microservices.user_service.configs.auth_config import ALGORITHM, SECRET_KEY
+from microservices.user_service.configs.logging_config import access_log_sampler
+from microservices.user_service.services.rate_limiter import create_rate_limiter
+
+load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
+    """
+    Чистый ASGI вместо BaseHTTPMiddleware: без отдельной задачи на запрос
+    и без обертки над потоком тела, поэтому StreamingResponse не буферизуется
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
         start_time = time.time()
-        
-        logger.info(f"Incoming: {request.method} {request.url.path}")
-        
-        response = await call_next(request)
-        
-        process_time = time.time() - start_time
-        
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        logger.info(
-            f"Completed: {request.method} {request.url.path} "
-            f"Status: {response.status_code} Time: {process_time:.3f}s"
-        )
-        
-        return response
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=120; includeSubDomains"
-        
-        return response
-
-rate_limiter = RateLimitInfo(max_requests=100, window_seconds=60)
-
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        client_ip = request.client.host if request.client else "unknown"
-        
-        excluded_paths = ["/docs", "/openapi.json", "/redoc"]
-        if request.url.path in excluded_paths:
-            return await call_next(request)
-        
-        allowed, remaining = rate_limiter.is_allowed(client_ip)
-        
+        method = scope["method"]
+        path = scope["path"]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Incoming: %s %s", method, path)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(process_time)
+
+                status = message["status"]
+                if logger.isEnabledFor(logging.INFO) and access_log_sampler.should_log(status, process_time):
+                    logger.info(
+                        "Completed: %s %s Status: %s Time: %.3fs",
+                        method, path, status, process_time,
+                        extra={
+                            "method": method,
+                            "path": path,
+                            "status": status,
+                            "duration_ms": round(process_time * 1000, 2),
+                        },
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class SecurityHeadersMiddleware:
+
+    security_headers = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Strict-Transport-Security": "max-age=120; includeSubDomains",
+    }
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.security_headers.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# Формат: путь=промах[:попадание в кэш], через запятую
+DEFAULT_ROUTE_COSTS = ""
+
+RATE_LIMIT_MAX_REQUESTS = int(os.getenv("RATE_LIMIT_MAX_REQUESTS", "100"))
+RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
+
+
+class RouteCost:
+    __slots__ = ("miss", "hit")
+
+    def __init__(self, miss: int, hit: int | None = None):
+        self.miss = miss
+        self.hit = miss if hit is None else hit
+
+
+def parse_route_costs(value: str) -> dict[str, RouteCost]:
+    """'/weather/current=5:1,/weather/batch=50' -> {путь: RouteCost}"""
+    costs = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        path, _, cost = item.strip().partition("=")
+        miss, _, hit = cost.partition(":")
+        costs[path] = RouteCost(int(miss), int(hit) if hit else None)
+    return costs
+
+
+ROUTE_COSTS = parse_route_costs(os.getenv("RATE_LIMIT_ROUTE_COSTS", DEFAULT_ROUTE_COSTS))
+DEFAULT_COST = RouteCost(1)
+
+# Ответ отдан из кэша, к Google не обращались
+CACHED_STATUSES = {"HIT", "STALE"}
+# Запрос отклонен до обращения к сервису
+REJECTED_STATUSES = {401, 403, 422}
+
+rate_limiter = create_rate_limiter(
+    max_requests=RATE_LIMIT_MAX_REQUESTS,
+    window_seconds=RATE_LIMIT_WINDOW,
+    name="user",
+)
+
+
+def get_client_id(scope: Scope) -> str:
+    """Пользователь из JWT (sub), без валидного токена — IP-адрес"""
+    authorization = Headers(scope=scope).get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            username = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+        except InvalidTokenError:
+            username = None
+        if username:
+            return f"user:{username}"
+
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """
+    Лимит на клиента с весом запроса по маршруту (ROUTE_COSTS).
+
+    До обработки списывается стоимость попадания в кэш. Если ответ
+    собран не из кэша (нет X-Cache: HIT/STALE), разница до стоимости
+    промаха доплачивается, даже сверх лимита: работа уже выполнена, а
+    долг уменьшит бюджет клиента на следующие запросы.
+    """
+
+    excluded_paths = {"/docs", "/openapi.json", "/redoc", "/metrics"}
+
+    def __init__(self, app: ASGIApp, route_costs: dict[str, RouteCost] | None = None):
+        self.app = app
+        self.route_costs = ROUTE_COSTS if route_costs is None else route_costs
+
+    def _limit_headers(self, remaining: int) -> dict[str, str]:
+        reset_after = int(rate_limiter.reset_after()) + 1
+        return {
+            "RateLimit-Limit": str(rate_limiter.max_requests),
+            "RateLimit-Remaining": str(remaining),
+            "RateLimit-Reset": str(reset_after),
+            "X-RateLimit-Limit": str(rate_limiter.max_requests),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(time.time()) + reset_after),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client_id = get_client_id(scope)
+        cost = self.route_costs.get(scope["path"], DEFAULT_COST)
+
+        allowed, remaining = await rate_limiter.is_allowed(client_id, cost.hit)
+
         if not allowed:
-            logger.warning(f"Rate limit exceeded for {client_ip}")
-            return Response(
+            logger.warning("Rate limit exceeded for %s", client_id)
+            headers = self._limit_headers(0)
+            headers["Retry-After"] = headers["RateLimit-Reset"]
+            response = Response(
                 content='{"error": "Rate limit exceeded. Please try again later."}',
                 status_code=429,
                 media_type="application/json",
-                headers={
-                    "X-RateLimit-Limit": str(rate_limiter.max_requests),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(time.time() + rate_limiter.window_seconds))
-                }
+                headers=headers,
             )
-        
-        response = await call_next(request)
-        
-        response.headers["X-RateLimit-Limit"] = str(rate_limiter.max_requests)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        
-        return response
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal remaining
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+
+                surcharge = cost.miss - cost.hit
+                if (
+                    surcharge > 0
+                    and headers.get("X-Cache") not in CACHED_STATUSES
+                    and message["status"] not in REJECTED_STATUSES
+                ):
+                    _, remaining = await rate_limiter.is_allowed(client_id, surcharge, force=True)
+
+                for name, value in self._limit_headers(remaining).items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -7,6 +7,7 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from microservices.user_service.configs.db import close_mongodb_connection, connect_to_mongodb
+from microservices.user_service.configs.logging_config import setup_logging, shutdown_logging
 from microservices.user_service.handlers.exceptions import (
     general_exception_handler,
     http_exception_handler,
@@ -16,14 +17,17 @@ from microservices.user_service.handlers.middleware import (
     RequestLoggingMiddleware,
     SecurityHeadersMiddleware,
 )
+from microservices.user_service.handlers.responses import ORJSONResponse
 from microservices.user_service.routes import user
 
 
 @asynccontextmanager
 async def lifespan(app):
+    setup_logging()
     await connect_to_mongodb()
     yield
     await close_mongodb_connection()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -56,6 +60,6 @@ app.add_middleware(
 app.include_router(user.router)
 
 
-@app.get("/")
+@app.get("/", response_class=ORJSONResponse)
 async def root():
     return {"service": "user", "status": "ok"}
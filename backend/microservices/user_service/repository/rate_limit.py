@@ -0,0 +1,44 @@
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from microservices.user_service.configs.db import get_database
+
+
+class RateLimitRepository:
+    """Общие для всех реплик счетчики запросов по окнам"""
+
+    def __init__(self):
+        pass
+
+    def _get_collection(self):
+        db = get_database()
+        if db is None:
+            raise Exception("База данных не подключена")
+        return db.rate_limits
+
+    async def reserve(self, key: str, amount: int, expires_at: datetime) -> int:
+        """Атомарно прибавить amount к счетчику окна; возвращает новое значение"""
+
+        collection = self._get_collection()
+
+        for _ in range(2):
+            try:
+                counter = await collection.find_one_and_update(
+                    {"_id": key},
+                    {
+                        "$inc": {"count": amount},
+                        "$setOnInsert": {"expires_at": expires_at},
+                    },
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+                return counter["count"]
+            except DuplicateKeyError:
+                # Две реплики одновременно создали счетчик; повтор найдет готовый
+                continue
+
+        raise Exception(f"Не удалось обновить счетчик {key}")
+
+
+rate_limit_repository = RateLimitRepository()
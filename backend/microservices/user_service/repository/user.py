@@ -1,9 +1,11 @@
 from typing import Optional
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 from microservices.user_service.configs.db import get_database
 from microservices.user_service.models.user_model import User, UserInDB
+from microservices.user_service.services.user_cache import user_cache
 
 
 class UserRepository:
@@ -18,16 +20,20 @@ class UserRepository:
         return db.users
     
     async def create_user(self, user_data: dict) -> UserInDB:
+        """
+        Один insert без предварительных проверок: занятые username и email
+        отсекают уникальные индексы (DuplicateKeyError, см. duplicate_key_field)
+        """
         collection = self._get_collection()
         
-        user_data["created_at"] = datetime.utcnow()
-        user_data["updated_at"] = datetime.utcnow()
+        now = datetime.utcnow()
+        user_data["created_at"] = now
+        user_data["updated_at"] = now
         
-        result = await collection.insert_one(user_data)
+        # insert_one дописывает _id в user_data: перечитывать документ не нужно
+        await collection.insert_one(user_data)
         
-        created_user = await collection.find_one({"_id": result.inserted_id})
-        
-        return UserInDB(**self._convert_mongo_document(created_user))
+        return UserInDB(**self._convert_mongo_document(dict(user_data)))
     
     async def get_user_by_username(self, username: str) -> Optional[UserInDB]:
         
@@ -72,6 +78,10 @@ class UserRepository:
             return_document=True
         )
         
+        user_cache.invalidate(username)
+        if "username" in update_data:
+            user_cache.invalidate(update_data["username"])
+        
         if result:
             return UserInDB(**self._convert_mongo_document(result))
         return None
@@ -80,6 +90,7 @@ class UserRepository:
         
         collection = self._get_collection()
         result = await collection.delete_one({"username": username})
+        user_cache.invalidate(username)
         return result.deleted_count > 0
     
     async def user_exists(self, username: str) -> bool:
@@ -106,4 +117,19 @@ class UserRepository:
         return doc
 
 
+def duplicate_key_field(error: DuplicateKeyError) -> Optional[str]:
+    """Поле уникального индекса, из-за которого не прошла вставка"""
+    details = error.details or {}
+    key_pattern = details.get("keyPattern") or details.get("keyValue")
+    if key_pattern:
+        return next(iter(key_pattern))
+    
+    # Старые версии MongoDB сообщают только имя индекса: "index: email_1 dup key"
+    message = details.get("errmsg") or str(error)
+    for field in ("username", "email"):
+        if f"index: {field}_1" in message:
+            return field
+    return None
+
+
 user_repository = UserRepository()
@@ -2,6 +2,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Security
 
+from microservices.user_service.handlers.responses import ORJSONResponse
 from microservices.user_service.models.user_model import User
 from microservices.user_service.services.auth import get_current_active_user, get_current_user
 
@@ -16,7 +17,7 @@ async def read_users_me(
     return current_user
 
 
-@router.get("/me/items")
+@router.get("/me/items", response_class=ORJSONResponse)
 async def read_own_items(
     current_user: Annotated[User, Security(get_current_active_user, scopes=["items"])],
 ):
@@ -24,7 +25,7 @@ async def read_own_items(
     return [{"item_id": "Foo", "owner": current_user.username}]
 
 
-@router.get("/status")
+@router.get("/status", response_class=ORJSONResponse)
 async def read_system_status(
     current_user: Annotated[User, Depends(get_current_user)]
 ):
@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
@@ -7,6 +8,7 @@ from fastapi.security import SecurityScopes
 from jwt.exceptions import InvalidTokenError
 from pwdlib import PasswordHash
 from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
 
 from microservices.user_service.configs.auth_config import (
     SECRET_KEY, 
@@ -16,8 +18,10 @@ from microservices.user_service.configs.auth_config import (
 )
 from microservices.user_service.models.user_model import User, UserInDB
 from microservices.user_service.models.token_model import Token, TokenData
-from microservices.user_service.repository.user import user_repository
+from microservices.user_service.repository.user import duplicate_key_field, user_repository
+from microservices.user_service.services.user_cache import user_cache
 
+logger = logging.getLogger(__name__)
 
 password_hash = PasswordHash.recommended()
 
@@ -34,6 +38,15 @@ async def get_user(username: str) -> UserInDB | None:
     return await user_repository.get_user_by_username(username)
 
 
+async def get_user_cached(username: str) -> UserInDB | None:
+    user = user_cache.get(username)
+    if user is None:
+        user = await get_user(username)
+        if user is not None:
+            user_cache.put(user)
+    return user
+
+
 async def authenticate_user(username: str, password: str) -> UserInDB | bool:
     user = await get_user(username)
     if not user:
@@ -43,19 +56,13 @@ async def authenticate_user(username: str, password: str) -> UserInDB | bool:
     return user
 
 
-async def create_user(username: str, email: str, password: str, full_name: str = None) -> UserInDB:
+DUPLICATE_USER_MESSAGES = {
+    "username": "Пользователь с таким именем уже существует",
+    "email": "Email уже используется",
+}
 
-    if await user_repository.user_exists(username):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Пользователь с таким именем уже существует"
-        )
-    
-    if await user_repository.email_exists(email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email уже используется"
-        )
+
+async def create_user(username: str, email: str, password: str, full_name: str = None) -> UserInDB:
     
     user_data = {
         "username": username,
@@ -65,7 +72,14 @@ async def create_user(username: str, email: str, password: str, full_name: str =
         "disabled": False
     }
     
-    return await user_repository.create_user(user_data)
+    try:
+        return await user_repository.create_user(user_data)
+    except DuplicateKeyError as e:
+        field = duplicate_key_field(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=DUPLICATE_USER_MESSAGES.get(field, "Пользователь уже существует")
+        )
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -103,16 +117,16 @@ async def get_current_user(
         scope: str = payload.get("scope", "")
         token_scopes = scope.split(" ") if scope else []
         
-        print(f"[DEBUG] Token decoded for user: {username}")
-        print(f"[DEBUG] Token scope string: '{scope}'")
-        print(f"[DEBUG] Token scopes list: {token_scopes}")
-        print(f"[DEBUG] Required scopes: {security_scopes.scopes}")
+        logger.debug(
+            "Token decoded for user: %s scopes: %s required: %s",
+            username, token_scopes, security_scopes.scopes,
+        )
         
         token_data = TokenData(scopes=token_scopes, username=username)
     except (InvalidTokenError, ValidationError):
         raise credentials_exception
     
-    user = await get_user(username=token_data.username)
+    user = await get_user_cached(username=token_data.username)
     if user is None:
         raise credentials_exception
     
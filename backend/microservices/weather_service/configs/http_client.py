@@ -0,0 +1,72 @@
+import os
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5"))
+UPSTREAM_POOL_TIMEOUT = float(os.getenv("UPSTREAM_POOL_TIMEOUT", "5"))
+
+# Таймауты чтения по эндпоинтам (секунды)
+UPSTREAM_TIMEOUTS = {
+    "geocode": float(os.getenv("GEOCODE_TIMEOUT", "5")),
+    "current": float(os.getenv("WEATHER_CURRENT_TIMEOUT", "10")),
+    "hourly": float(os.getenv("WEATHER_HOURLY_TIMEOUT", "15")),
+    "daily": float(os.getenv("WEATHER_DAILY_TIMEOUT", "15")),
+}
+
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = os.getenv("UPSTREAM_HTTP2", "true").lower() == "true"
+except ImportError:
+    HTTP2_ENABLED = False
+
+client: httpx.AsyncClient = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=UPSTREAM_MAX_CONNECTIONS,
+        max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        max(UPSTREAM_TIMEOUTS.values()),
+        connect=UPSTREAM_CONNECT_TIMEOUT,
+        pool=UPSTREAM_POOL_TIMEOUT,
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=HTTP2_ENABLED)
+
+
+async def open_http_client():
+    global client
+    if client is None or client.is_closed:
+        client = _build_client()
+        print(f"HTTP-клиент для внешних API создан (http2={HTTP2_ENABLED})")
+
+
+async def close_http_client():
+    global client
+    if client is not None:
+        await client.aclose()
+        client = None
+        print("HTTP-клиент для внешних API закрыт")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global client
+    if client is None or client.is_closed:
+        # Вне lifespan (скрипты, фоновые задачи) создаем клиент лениво
+        client = _build_client()
+    return client
+
+
+def get_timeout(endpoint: str) -> httpx.Timeout:
+    return httpx.Timeout(
+        UPSTREAM_TIMEOUTS[endpoint],
+        connect=UPSTREAM_CONNECT_TIMEOUT,
+        pool=UPSTREAM_POOL_TIMEOUT,
+    )
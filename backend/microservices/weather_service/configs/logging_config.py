@@ -0,0 +1,146 @@
+import copy
+import logging
+import os
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SERVICE_NAME = "weather_service"
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# json — одна JSON-строка на запись, text — читаемый вывод для разработки
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+# Доля access-логов успешных запросов, которые пишутся под нагрузкой
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "0.1"))
+# Выше этого числа запросов в секунду включается выборка
+ACCESS_LOG_SAMPLE_AFTER = int(os.getenv("ACCESS_LOG_SAMPLE_AFTER", "50"))
+# Ошибки и медленные запросы пишутся всегда
+ACCESS_LOG_SLOW_SECONDS = float(os.getenv("ACCESS_LOG_SLOW_SECONDS", "1.0"))
+
+# Стандартные атрибуты LogRecord, все остальные считаются полями из extra
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+# Сторонние логгеры, которые на INFO пишут по строке на каждый запрос
+# (у httpx в строке еще и URL с ключом API)
+_NOISY_LOGGERS = ("httpx", "httpcore")
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись лога одной строкой JSON, поля из extra попадают в корень объекта"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "service": SERVICE_NAME,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class _QueueHandler(QueueHandler):
+    """
+    В отличие от стандартного prepare() не склеивает запись в строку:
+    форматирование выполняет поток-писатель, в потоке запроса остается
+    только подстановка аргументов и текст исключения
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging() -> None:
+    """Корневой логгер пишет в очередь, в stdout пишет фоновый поток"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [_QueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+    for name in _NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Дописать оставшиеся в очереди записи и остановить поток-писатель"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class AccessLogSampler:
+    """
+    Выборка access-логов: пока запросов в секунду не больше threshold,
+    пишется каждый, дальше — только доля rate от успешных и быстрых
+    """
+
+    def __init__(
+        self,
+        rate: float = ACCESS_LOG_SAMPLE_RATE,
+        threshold: int = ACCESS_LOG_SAMPLE_AFTER,
+        slow_seconds: float = ACCESS_LOG_SLOW_SECONDS,
+    ):
+        self.rate = rate
+        self.threshold = threshold
+        self.slow_seconds = slow_seconds
+        self._second = 0
+        self._count = 0
+        self._credit = 0.0
+
+    def should_log(self, status: int, duration: float) -> bool:
+        second = int(time.monotonic())
+        if second != self._second:
+            self._second = second
+            self._count = 0
+        self._count += 1
+
+        if status >= 400 or duration >= self.slow_seconds:
+            return True
+        if self._count <= self.threshold:
+            return True
+
+        # Детерминированная выборка: каждый 1/rate-й запрос, без random()
+        self._credit += self.rate
+        if self._credit >= 1.0:
+            self._credit -= 1.0
+            return True
+        return False
+
+
+access_log_sampler = AccessLogSampler()
@@ -7,24 +7,41 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from microservices.weather_service.configs.db import close_mongodb_connection, connect_to_mongodb
+from microservices.weather_service.configs.logging_config import setup_logging, shutdown_logging
+from microservices.weather_service.configs.http_client import close_http_client, open_http_client
 from microservices.weather_service.handlers.exceptions import (
     general_exception_handler,
     http_exception_handler,
     validation_exception_handler,
 )
 from microservices.weather_service.handlers.middleware import (
+    RateLimitMiddleware,
     RequestLoggingMiddleware,
     SecurityHeadersMiddleware,
 )
+from microservices.weather_service.handlers.responses import ORJSONResponse
 from microservices.weather_service.routes import weather
 from microservices.weather_service.services import geocoding
+from microservices.weather_service.services.prefetch import PREFETCH_ENABLED, prefetch_scheduler
+from microservices.weather_service.services.weather import weather_service
+from microservices.weather_service.services.write_behind import weather_write_queue
 
 
 @asynccontextmanager
 async def lifespan(app):
+    setup_logging()
     await connect_to_mongodb()
+    await open_http_client()
+    weather_write_queue.start()
+    if PREFETCH_ENABLED:
+        prefetch_scheduler.start()
     yield
+    await prefetch_scheduler.stop()
+    await weather_service.close()
+    await weather_write_queue.stop()
+    await close_http_client()
     await close_mongodb_connection()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -44,6 +61,7 @@ app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(
@@ -57,12 +75,12 @@ app.add_middleware(
 app.include_router(weather.router)
 
 
-@app.get("/")
+@app.get("/", response_class=ORJSONResponse)
 async def root():
     return {"service": "weather", "status": "ok"}
 
 
-@app.get("/coordinates")
+@app.get("/coordinates", response_class=ORJSONResponse)
 async def get_coordinates(city: str):
     result = await geocoding.get_coordinates(city)
 
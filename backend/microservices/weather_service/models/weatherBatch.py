@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+
+from microservices.weather_service.models.weatherCurrent import CurrentWeatherResponse
+from microservices.weather_service.models.weatherHourly import HourlyWeatherResponse
+from microservices.weather_service.models.weatherDaily import DailyWeatherResponse
+
+BATCH_MAX_LOCATIONS = 500
+
+ForecastKind = Literal["current", "hourly", "daily"]
+
+
+class BatchLocation(BaseModel):
+    city: Optional[str] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def check_location(self):
+        has_coords = self.latitude is not None and self.longitude is not None
+        if not self.city and not has_coords:
+            raise ValueError("Either city or latitude and longitude must be provided")
+        return self
+
+
+class WeatherBatchRequest(BaseModel):
+    locations: List[BatchLocation] = Field(..., min_length=1, max_length=BATCH_MAX_LOCATIONS)
+    kinds: List[ForecastKind] = Field(default=["current"], min_length=1)
+    stream: bool = False
+
+
+class WeatherBatchItem(BaseModel):
+    index: int
+    city: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    current: Optional[CurrentWeatherResponse] = None
+    hourly: Optional[List[HourlyWeatherResponse]] = None
+    daily: Optional[List[DailyWeatherResponse]] = None
+
+    error: Optional[str] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional
 from datetime import datetime
 
@@ -73,6 +73,10 @@ class CurrentWeather(CustomBaseModel):
     
     sunEvents: Optional[SunEvents] = None
 
+
+current_weather_adapter = TypeAdapter(CurrentWeather)
+
+
 class CurrentWeatherResponse(CustomBaseModel):
     temperature: float
     feels_like: Optional[float]
@@ -87,10 +91,14 @@ class CurrentWeatherResponse(CustomBaseModel):
     wind_speed: Optional[float]
     sunrise: Optional[datetime]
     sunset: Optional[datetime]
-    
-    
+
+
+current_response_adapter = TypeAdapter(CurrentWeatherResponse)
+
+
 def map_current(weather: CurrentWeather) -> CurrentWeatherResponse:
-    return CurrentWeatherResponse(
+    # Поля уже проверены при разборе ответа Google, повторная валидация не нужна
+    return CurrentWeatherResponse.model_construct(
         temperature=weather.temperature.degrees,
         feels_like=(
             weather.feelsLikeTemperature.degrees
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 
@@ -58,6 +58,11 @@ class ForecastDay(CustomBaseModel):
 
 class DailyWeather(CustomBaseModel):
     forecastDays: List[ForecastDay]
+    # Следующая страница, если прогноз не поместился в pageSize
+    nextPageToken: Optional[str] = None
+
+
+daily_weather_adapter = TypeAdapter(DailyWeather)
 
 
 class DailyWeatherResponse(CustomBaseModel):
@@ -81,12 +86,16 @@ class DailyWeatherResponse(CustomBaseModel):
     sunset: datetime
 
 
+daily_response_adapter = TypeAdapter(DailyWeatherResponse)
+daily_list_adapter = TypeAdapter(List[DailyWeatherResponse])
+
+
 def build_icon_url(icon_base: str, is_day: bool) -> str:
     suffix = ".svg" if is_day else "_dark.svg"
     return f"{icon_base}{suffix}"
 
 def map_day(day: ForecastDay) -> DailyWeatherResponse:
-    return DailyWeatherResponse(
+    return DailyWeatherResponse.model_construct(
         date=f"{day.displayDate.year}-{day.displayDate.month}-{day.displayDate.day}",
 
         max_temp=day.maxTemperature.degrees,
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List
+
+from microservices.weather_service.models.weatherCurrent import CurrentWeatherResponse
+from microservices.weather_service.models.weatherHourly import HourlyWeatherResponse
+from microservices.weather_service.models.weatherDaily import DailyWeatherResponse
+
+
+class WeatherDashboardResponse(BaseModel):
+    city: str
+    current: CurrentWeatherResponse
+    hourly: List[HourlyWeatherResponse]
+    daily: List[DailyWeatherResponse]
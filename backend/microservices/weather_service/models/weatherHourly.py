@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
 
@@ -63,6 +63,11 @@ class ForecastHour(CustomBaseModel):
 
 class HourlyWeather(CustomBaseModel):
     forecastHours: List[ForecastHour]
+    # Следующая страница, если прогноз не поместился в pageSize
+    nextPageToken: Optional[str] = None
+
+
+hourly_weather_adapter = TypeAdapter(HourlyWeather)
 
 
 class HourlyWeatherResponse(CustomBaseModel):
@@ -83,13 +88,16 @@ class HourlyWeatherResponse(CustomBaseModel):
     is_day: bool
 
 
+hourly_list_adapter = TypeAdapter(List[HourlyWeatherResponse])
+
+
 def build_icon_url(icon_base: str, is_day: bool) -> str:
     suffix = ".svg" if is_day else "_dark.svg"
     return f"{icon_base}{suffix}"
 
 
 def map_hour(hour: ForecastHour) -> HourlyWeatherResponse:
-    return HourlyWeatherResponse(
+    return HourlyWeatherResponse.model_construct(
         time=hour.interval.startTime,
         temperature=hour.temperature.degrees,
         feels_like=(
@@ -0,0 +1,49 @@
+from typing import Optional
+from datetime import datetime
+
+from microservices.weather_service.configs.db import get_database
+
+
+class GeocodeRepository:
+
+    def __init__(self):
+        pass
+
+    def _get_collection(self):
+        db = get_database()
+        if db is None:
+            raise Exception("База данных не подключена")
+        return db.geocodes
+
+    async def get_coordinates(self, key: str) -> Optional[dict]:
+
+        collection = self._get_collection()
+        doc = await collection.find_one(
+            {"key": key},
+            {"_id": 0, "latitude": 1, "longitude": 1}
+        )
+
+        if doc:
+            return {"latitude": doc["latitude"], "longitude": doc["longitude"]}
+        return None
+
+    async def save_coordinates(self, key: str, city: str, coordinates: dict) -> None:
+
+        collection = self._get_collection()
+
+        await collection.update_one(
+            {"key": key},
+            {
+                "$set": {
+                    "city": city,
+                    "latitude": coordinates["latitude"],
+                    "longitude": coordinates["longitude"],
+                    "updated_at": datetime.utcnow(),
+                },
+                "$setOnInsert": {"created_at": datetime.utcnow()},
+            },
+            upsert=True
+        )
+
+
+geocode_repository = GeocodeRepository()
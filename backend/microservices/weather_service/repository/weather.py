@@ -29,6 +29,22 @@ class WeatherRepository:
         
         return self._convert_mongo_document(saved_weather)
     
+    async def save_weather_many(self, weather_list: List[dict]) -> List[str]:
+        
+        if not weather_list:
+            return []
+        
+        collection = self._get_collection()
+        
+        now = datetime.utcnow()
+        for weather_data in weather_list:
+            weather_data.setdefault("timestamp", now)
+            weather_data["created_at"] = now
+        
+        result = await collection.insert_many(weather_list, ordered=False)
+        
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    
     async def get_weather_by_city(
         self, 
         city: str, 
@@ -93,6 +109,27 @@ class WeatherRepository:
         cities = await collection.distinct("city")
         return cities
     
+    async def get_popular_cities(self, hours: int = 24, limit: int = 50) -> List[dict]:
+        
+        collection = self._get_collection()
+        
+        since = datetime.utcnow() - timedelta(hours=hours)
+        
+        # Документы одного запроса записываются с общим timestamp,
+        # поэтому пара (city, timestamp) соответствует одному запросу
+        pipeline = [
+            {"$match": {"timestamp": {"$gte": since}}},
+            {"$group": {"_id": {"city": "$city", "timestamp": "$timestamp"}}},
+            {"$group": {"_id": "$_id.city", "requests": {"$sum": 1}}},
+            {"$sort": {"requests": -1}},
+            {"$limit": limit},
+        ]
+        
+        cursor = collection.aggregate(pipeline)
+        result = await cursor.to_list(length=limit)
+        
+        return [{"city": doc["_id"], "requests": doc["requests"]} for doc in result]
+    
     async def get_weather_statistics(self, city: str, days: int = 7) -> dict:
         
         collection = self._get_collection()
@@ -1,26 +1,79 @@
+from email.utils import formatdate
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, Security, HTTPException
+from fastapi import APIRouter, Depends, Request, Response, Security, HTTPException
+from fastapi.responses import StreamingResponse
 
+from microservices.weather_service.handlers.middleware import prepay_units, refund_units
 from microservices.weather_service.models.user_model import User
 from microservices.weather_service.models.weatherCurrent import CurrentWeatherResponse
 from microservices.weather_service.models.weatherHourly import HourlyWeatherResponse
 from microservices.weather_service.models.weatherDaily import DailyWeatherResponse
+from microservices.weather_service.models.weatherDashboard import WeatherDashboardResponse
+from microservices.weather_service.models.weatherBatch import WeatherBatchItem, WeatherBatchRequest
 from microservices.weather_service.services.auth import get_current_active_user
-from microservices.weather_service.services.weather import weather_service
+from microservices.weather_service.services.cache import CachedBody
+from microservices.weather_service.services.weather import Freshness, track_freshness, weather_service
 
 router = APIRouter(prefix="/weather", tags=["weather"])
 
 
+def _set_freshness_headers(response: Response, freshness: Freshness) -> None:
+    if freshness.status is None:
+        return
+    response.headers["Age"] = str(int(freshness.age))
+    response.headers["X-Cache"] = freshness.status
+
+
+def _set_validator_headers(response: Response, body: CachedBody, freshness: Freshness) -> None:
+    response.headers["ETag"] = body.etag
+    # Ответы зависят от пользователя, поэтому кэшировать их может только клиент.
+    # Клиент сам вычитает Age из max-age (RFC 9111), поэтому при заголовке Age
+    # max-age — полный срок жизни записи, а не остаток
+    max_age = int(freshness.ttl_remaining or 0)
+    if freshness.status is not None:
+        max_age += int(freshness.age)
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    if freshness.last_modified is not None:
+        response.headers["Last-Modified"] = formatdate(freshness.last_modified, usegmt=True)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Слабое сравнение из RFC 9110: префикс W/ не учитывается"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def _json_response(request: Request, body: CachedBody, freshness: Freshness) -> Response:
+    """
+    Готовое тело из кэша отдается как есть, без повторной сериализации.
+    Если у клиента та же версия (If-None-Match), отдается 304 без тела.
+    """
+    if _etag_matches(request.headers.get("if-none-match"), body.etag):
+        response = Response(status_code=304)
+    else:
+        response = Response(content=body.body, media_type="application/json")
+    _set_validator_headers(response, body, freshness)
+    _set_freshness_headers(response, freshness)
+    return response
+
+
 @router.get("/current", response_model=CurrentWeatherResponse)
 async def get_current_weather(
     current_user: Annotated[User, Security(get_current_active_user, scopes=["weather"])],
     city: str,
+    request: Request,
 ):
-    
+    freshness = track_freshness()
     try:
         weather = await weather_service.get_current_weather(city)
-        return weather
+        return _json_response(request, weather, freshness)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -31,10 +84,12 @@ async def get_current_weather(
 async def get_hourly_12_hours(
     current_user: Annotated[User, Security(get_current_active_user, scopes=["weather"])],
     city: str,
+    request: Request,
 ):
+    freshness = track_freshness()
     try:
         forecast = await weather_service.get_hourly_12_hours(city)
-        return forecast
+        return _json_response(request, forecast, freshness)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -45,11 +100,12 @@ async def get_hourly_12_hours(
 async def get_tomorrow_weather(
     current_user: Annotated[User, Security(get_current_active_user, scopes=["weather"])],
     city: str,
+    request: Request,
 ):
-
+    freshness = track_freshness()
     try:
         weather = await weather_service.get_tomorrow_weather(city)
-        return weather
+        return _json_response(request, weather, freshness)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -60,11 +116,12 @@ async def get_tomorrow_weather(
 async def get_3_days_forecast(
     current_user: Annotated[User, Security(get_current_active_user, scopes=["weather"])],
     city: str,
+    request: Request,
 ):
-
+    freshness = track_freshness()
     try:
         forecast = await weather_service.get_3_days_forecast(city)
-        return forecast
+        return _json_response(request, forecast, freshness)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -75,11 +132,64 @@ async def get_3_days_forecast(
 async def get_7_days_forecast(
     current_user: Annotated[User, Security(get_current_active_user, scopes=["weather"])],
     city: str,
+    request: Request,
 ):
+    freshness = track_freshness()
     try:
         forecast = await weather_service.get_7_days_forecast(city)
-        return forecast
+        return _json_response(request, forecast, freshness)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка получения прогноза: {str(e)}")
+
+
+@router.get("/dashboard", response_model=WeatherDashboardResponse)
+async def get_weather_dashboard(
+    current_user: Annotated[User, Security(get_current_active_user, scopes=["weather"])],
+    city: str,
+    request: Request,
+):
+    freshness = track_freshness()
+    try:
+        dashboard = await weather_service.get_dashboard(city)
+        return _json_response(request, dashboard, freshness)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка получения погоды: {str(e)}")
+
+
+@router.post("/batch", response_model=List[WeatherBatchItem])
+async def get_weather_batch(
+    current_user: Annotated[User, Security(get_current_active_user, scopes=["weather"])],
+    request: WeatherBatchRequest,
+    http_request: Request,
+):
+    # Каждый элемент может стоить запроса к Google: бюджет на все элементы
+    # проверяется до начала работы, а отданное из кэша потом возвращается
+    kinds = list(dict.fromkeys(request.kinds))
+    await prepay_units(http_request, len(request.locations) * len(kinds))
+    
+    freshness = track_freshness()
+    items = weather_service.iter_batch(request.locations, kinds)
+    
+    if request.stream:
+        async def ndjson():
+            try:
+                async for _, body in items:
+                    yield body + b"\n"
+            finally:
+                refund_units(http_request, freshness.cached)
+        
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    try:
+        results = [item async for item in items]
+    finally:
+        refund_units(http_request, freshness.cached)
+    results.sort(key=lambda item: item[0])
+    return Response(
+        content=b"[" + b",".join(body for _, body in results) + b"]",
+        media_type="application/json",
+    )
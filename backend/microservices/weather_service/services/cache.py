@@ -0,0 +1,112 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class CachedBody:
+    """Готовое JSON-тело ответа и его ETag"""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes, etag: Optional[str] = None):
+        self.body = body
+        self.etag = etag or f'"{content_hash(body)}"'
+
+
+class CacheEntry:
+    __slots__ = ("value", "stored_at", "expires_at", "stale_until", "created_at", "bodies")
+
+    def __init__(self, value: Any, ttl: float, stale_ttl: float = 0.0):
+        now = time.monotonic()
+        self.value = value
+        self.stored_at = now
+        self.expires_at = now + ttl
+        self.stale_until = self.expires_at + stale_ttl
+        # Время записи по часам системы (для Last-Modified)
+        self.created_at = time.time()
+        # Сериализованные представления value по имени формы ответа
+        self.bodies: dict[str, CachedBody] = {}
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    @property
+    def stale_for(self) -> float:
+        return max(0.0, time.monotonic() - self.expires_at)
+
+    @property
+    def ttl_remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+class TTLCache:
+    """
+    Ограниченный по размеру LRU-кэш с временем жизни записей.
+
+    Запись со stale_ttl после истечения ttl еще хранится stale_ttl секунд:
+    get() ее уже не вернет, а get_entry() вернет с is_stale=True.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        if entry.stale_until <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        if entry is None or entry.is_stale:
+            return default
+        return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        stale_ttl: float = 0.0,
+    ) -> CacheEntry:
+        entry = CacheEntry(value, self.ttl if ttl is None else ttl, stale_ttl)
+        self._data[key] = entry
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+        return entry
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry.value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,14 +1,62 @@
-import httpx
+import logging
 import os
+import re
+import unicodedata
 from dotenv import load_dotenv
+from prometheus_client import Counter
+
+from microservices.weather_service.configs.http_client import get_http_client, get_timeout
+from microservices.weather_service.repository.geocode import geocode_repository
+from microservices.weather_service.services.cache import TTLCache
+from microservices.weather_service.services.singleflight import SingleFlight
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 
+GEOCODE_CACHE_MAXSIZE = int(os.getenv("GEOCODE_CACHE_MAXSIZE", "10000"))
+GEOCODE_CACHE_TTL = float(os.getenv("GEOCODE_CACHE_TTL", "86400"))
 
-async def get_coordinates(city: str):
+geocode_cache_requests = Counter(
+    "weather_geocode_cache_requests_total",
+    "Обращения к кэшу геокодинга",
+    ["result"],
+)
+
+_memory_cache = TTLCache(maxsize=GEOCODE_CACHE_MAXSIZE, ttl=GEOCODE_CACHE_TTL)
+_geocode_flight = SingleFlight("geocode")
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_city(city: str) -> str:
+    normalized = unicodedata.normalize("NFKC", city)
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
+    return normalized.casefold()
+
+
+def _record(result: str) -> None:
+    _stats[result] += 1
+    geocode_cache_requests.labels(result=result).inc()
+
+
+def get_cache_stats() -> dict:
+    total = sum(_stats.values())
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    return {
+        **_stats,
+        "size": len(_memory_cache),
+        "coalesced": _geocode_flight.stats["coalesced"],
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+async def _fetch_coordinates(city: str):
     if not GOOGLE_API_KEY:
         raise ValueError("Google API key is not configured. Please set GOOGLE_API_KEY in .env file")
 
@@ -17,8 +65,8 @@ async def get_coordinates(city: str):
         "key": GOOGLE_API_KEY
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(GEOCODE_URL, params=params)
+    client = get_http_client()
+    response = await client.get(GEOCODE_URL, params=params, timeout=get_timeout("geocode"))
 
     data = response.json()
 
@@ -35,3 +83,39 @@ async def get_coordinates(city: str):
         "latitude": location["lat"],
         "longitude": location["lng"]
     }
+
+
+async def _resolve_coordinates(key: str, city: str) -> dict:
+    try:
+        coords = await geocode_repository.get_coordinates(key)
+    except Exception as e:
+        logger.warning("Geocode cache read failed: %s", e)
+        coords = None
+
+    if coords is not None:
+        _record("db_hits")
+        _memory_cache.set(key, coords)
+        return coords
+
+    _record("misses")
+    coords = await _fetch_coordinates(city)
+    _memory_cache.set(key, coords)
+
+    try:
+        await geocode_repository.save_coordinates(key, city, coords)
+    except Exception as e:
+        logger.warning("Geocode cache write failed: %s", e)
+
+    return coords
+
+
+async def get_coordinates(city: str):
+    key = normalize_city(city)
+
+    coords = _memory_cache.get(key)
+    if coords is not None:
+        _record("memory_hits")
+        return dict(coords)
+
+    coords = await _geocode_flight.do(key, lambda: _resolve_coordinates(key, city))
+    return dict(coords)
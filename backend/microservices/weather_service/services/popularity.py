@@ -0,0 +1,53 @@
+import heapq
+import time
+from typing import Hashable, List, Tuple
+
+
+class DecayingCounter:
+    """
+    Счетчик популярности с экспоненциальным затуханием.
+
+    Вместо пересчета всех счетчиков вес каждого обращения растет со временем
+    как 2^(t / half_life), поэтому сравнение ключей между собой остается
+    корректным, а hit() стоит O(1).
+    """
+
+    # Порог, после которого веса пересчитываются к новой точке отсчета
+    _RESCALE_EXPONENT = 512
+
+    def __init__(self, half_life: float = 3600.0, maxsize: int = 10000):
+        self.half_life = half_life
+        self.maxsize = maxsize
+        self._epoch = time.monotonic()
+        self._scores: dict[Hashable, float] = {}
+
+    def _weight(self, now: float) -> float:
+        exponent = (now - self._epoch) / self.half_life
+        if exponent > self._RESCALE_EXPONENT:
+            factor = 2.0 ** -exponent
+            self._scores = {key: score * factor for key, score in self._scores.items()}
+            self._epoch = now
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def hit(self, key: Hashable, weight: float = 1.0) -> None:
+        self._scores[key] = self._scores.get(key, 0.0) + weight * self._weight(time.monotonic())
+
+        if len(self._scores) > self.maxsize * 1.25:
+            self._scores = dict(
+                heapq.nlargest(self.maxsize, self._scores.items(), key=lambda item: item[1])
+            )
+
+    def top(self, n: int) -> List[Tuple[Hashable, float]]:
+        """n самых популярных ключей с текущим (затухшим) счетом"""
+        scale = 1.0 / self._weight(time.monotonic())
+        return [
+            (key, score * scale)
+            for key, score in heapq.nlargest(n, self._scores.items(), key=lambda item: item[1])
+        ]
+
+    def score(self, key: Hashable) -> float:
+        return self._scores.get(key, 0.0) / self._weight(time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._scores)
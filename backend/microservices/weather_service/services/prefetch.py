@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+
+from dotenv import load_dotenv
+from prometheus_client import Counter
+
+from microservices.weather_service.repository.weather import weather_repository
+from microservices.weather_service.services.geocoding import get_coordinates
+from microservices.weather_service.services.rate_limiter import create_rate_limiter
+from microservices.weather_service.services.weather import WeatherService, weather_service
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", "30"))
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "50"))
+# Обновлять запись, если до истечения TTL осталось меньше этого
+PREFETCH_LEAD_SECONDS = float(os.getenv("PREFETCH_LEAD_SECONDS", "60"))
+# Максимум обращений к Google за PREFETCH_INTERVAL на все реплики вместе
+# (с RATE_LIMIT_BACKEND=memory — на каждую)
+PREFETCH_BUDGET = int(os.getenv("PREFETCH_BUDGET", "30"))
+PREFETCH_SEED_HOURS = int(os.getenv("PREFETCH_SEED_HOURS", "24"))
+
+prefetch_refreshes = Counter(
+    "weather_prefetch_refreshes_total",
+    "Упреждающие обновления прогнозов",
+    ["result"],
+)
+
+
+class PrefetchScheduler:
+    """
+    Заранее обновляет прогнозы для самых популярных локаций.
+
+    Кэш и популярность у каждой реплики свои, поэтому цикл выполняет
+    каждая реплика. Обращения к Google списываются с общего бюджета
+    через ClusterRateLimiter: при большем числе реплик обновления делятся
+    между ними, а не умножаются.
+    """
+
+    def __init__(
+        self,
+        service: WeatherService,
+        interval: float = PREFETCH_INTERVAL,
+        top_n: int = PREFETCH_TOP_N,
+        lead_seconds: float = PREFETCH_LEAD_SECONDS,
+        budget: int = PREFETCH_BUDGET,
+    ):
+        self.service = service
+        self.interval = interval
+        self.top_n = top_n
+        self.lead_seconds = lead_seconds
+        # Аренда по одному запросу: бюджет мал, и недобор из-за
+        # неистраченных остатков реплик был бы заметен
+        self.budget = create_rate_limiter(
+            max_requests=budget,
+            window_seconds=max(1, int(interval)),
+            name="weather_prefetch",
+            lease_size=1,
+        )
+        self._seeded = False
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not self._seeded:
+                    await self.seed_from_history()
+                await self.run_once()
+            except Exception as e:
+                logger.warning("Prefetch cycle failed: %s", e)
+
+            await asyncio.sleep(self.interval)
+
+    async def seed_from_history(self) -> None:
+        """Начальная популярность из истории запросов в коллекции weather"""
+        self._seeded = True
+
+        cities = await weather_repository.get_popular_cities(
+            hours=PREFETCH_SEED_HOURS,
+            limit=self.top_n,
+        )
+
+        for item in cities:
+            try:
+                coords = await get_coordinates(item["city"])
+            except Exception:
+                continue
+            for key in self.service.location_keys(coords):
+                self.service.popularity.hit(key, weight=item["requests"])
+
+    async def run_once(self) -> int:
+        calls = 0
+
+        for key, _ in self.service.popularity.top(self.top_n):
+            ttl_remaining = self.service.cache_ttl_remaining(key)
+            if ttl_remaining is not None and ttl_remaining > self.lead_seconds:
+                continue
+
+            allowed, _ = await self.budget.is_allowed("upstream")
+            if not allowed:
+                prefetch_refreshes.labels(result="budget").inc()
+                break
+
+            calls += 1
+            try:
+                await self.service.prefetch(key)
+                prefetch_refreshes.labels(result="ok").inc()
+            except Exception as e:
+                prefetch_refreshes.labels(result="error").inc()
+                logger.warning("Prefetch of %s failed: %s", key, e)
+
+        return calls
+
+
+prefetch_scheduler = PrefetchScheduler(weather_service)
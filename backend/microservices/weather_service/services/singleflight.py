@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from prometheus_client import Counter
+
+singleflight_calls = Counter(
+    "weather_singleflight_calls_total",
+    "Вызовы через single-flight: leader выполняет запрос, coalesced ждет чужой",
+    ["name", "role"],
+)
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные одинаковые вызовы в один.
+
+    Первый вызов по ключу запускает задачу, остальные ждут ее результата.
+    Отмена одного из ожидающих не отменяет общую задачу, а ошибка
+    задачи передается всем ожидающим.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+
+        if task is None:
+            self.stats["leaders"] += 1
+            singleflight_calls.labels(name=self.name, role="leader").inc()
+
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.stats["coalesced"] += 1
+            singleflight_calls.labels(name=self.name, role="coalesced").inc()
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Если все ожидающие отменились, ошибку никто не заберет
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
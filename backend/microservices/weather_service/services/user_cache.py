@@ -0,0 +1,58 @@
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from prometheus_client import Counter
+
+from microservices.weather_service.models.user_model import UserInDB
+from microservices.weather_service.services.cache import TTLCache
+
+load_dotenv()
+
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", "10000"))
+# Изменения из других сервисов и реплик (disabled, удаление) видны не позже TTL
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+
+user_cache_requests = Counter(
+    "weather_user_cache_requests_total",
+    "Обращения к кэшу пользователей в get_current_user",
+    ["result"],
+)
+
+
+class UserCache:
+    """Пользователи по username для проверки JWT без запроса к MongoDB"""
+
+    def __init__(self, maxsize: int = USER_CACHE_MAXSIZE, ttl: float = USER_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._stats = {"hits": 0, "misses": 0}
+
+    def _record(self, result: str) -> None:
+        self._stats[result] += 1
+        user_cache_requests.labels(result=result).inc()
+
+    def get(self, username: str) -> Optional[UserInDB]:
+        user = self._cache.get(username)
+        if user is None:
+            self._record("misses")
+            return None
+        self._record("hits")
+        # Копия, чтобы обработчик запроса не изменил закэшированный объект
+        return user.model_copy()
+
+    def put(self, user: UserInDB) -> None:
+        self._cache.set(user.username, user.model_copy())
+
+    def invalidate(self, username: str) -> None:
+        self._cache.pop(username)
+
+    def get_stats(self) -> dict:
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._cache),
+            "hit_ratio": self._stats["hits"] / total if total else 0.0,
+        }
+
+
+user_cache = UserCache()
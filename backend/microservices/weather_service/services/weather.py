@@ -1,24 +1,139 @@
-import httpx
+import asyncio
+import logging
 import os
-from typing import List
+from contextvars import ContextVar
+from datetime import datetime
+from typing import AsyncIterator, List
+import orjson
 from dotenv import load_dotenv
+from pydantic import ValidationError
 
-from microservices.weather_service.models.weatherCurrent import CurrentWeather, CurrentWeatherResponse, map_current
-from microservices.weather_service.models.weatherHourly import HourlyWeather, HourlyWeatherResponse, map_hour
-from microservices.weather_service.models.weatherDaily import DailyWeather, DailyWeatherResponse, map_day
+from microservices.weather_service.models.weatherCurrent import (
+    CurrentWeatherResponse, current_response_adapter, current_weather_adapter, map_current,
+)
+from microservices.weather_service.models.weatherHourly import (
+    HourlyWeatherResponse, hourly_list_adapter, hourly_weather_adapter, map_hour,
+)
+from microservices.weather_service.models.weatherDaily import (
+    DailyWeatherResponse, daily_list_adapter, daily_response_adapter, daily_weather_adapter, map_day,
+)
+from microservices.weather_service.models.weatherBatch import BatchLocation
+from microservices.weather_service.configs.http_client import get_http_client, get_timeout
+from microservices.weather_service.services.cache import CacheEntry, CachedBody, TTLCache, content_hash
 from microservices.weather_service.services.geocoding import get_coordinates
-from microservices.weather_service.repository.weather import weather_repository
+from microservices.weather_service.services.popularity import DecayingCounter
+from microservices.weather_service.services.singleflight import SingleFlight
+from microservices.weather_service.services.write_behind import weather_write_queue
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 WEATHER_API_BASE = "https://weather.googleapis.com/v1"
+# Ошибка элемента пакета для клиента; причина пишется в лог
+BATCH_ITEM_ERROR = "Ошибка получения погоды"
+
+# Горизонты, которые запрашиваются у Google целиком; короткие прогнозы
+# (завтра, 3 дня, 12 часов) получаются срезом из закэшированного списка
+HOURLY_FETCH_HOURS = int(os.getenv("HOURLY_FETCH_HOURS", "24"))
+DAILY_FETCH_DAYS = int(os.getenv("DAILY_FETCH_DAYS", "7"))
+# Максимальный pageSize у Google: остаток горизонта забирается по nextPageToken
+HOURLY_PAGE_SIZE = 24
+DAILY_PAGE_SIZE = 10
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "10"))
+
+FORECAST_CACHE_MAXSIZE = int(os.getenv("FORECAST_CACHE_MAXSIZE", "5000"))
+FORECAST_CACHE_TTLS = {
+    "current": float(os.getenv("CURRENT_CACHE_TTL", "300")),
+    "hourly": float(os.getenv("HOURLY_CACHE_TTL", "900")),
+    "daily": float(os.getenv("DAILY_CACHE_TTL", "3600")),
+}
+# Сколько секунд после истечения TTL отдавать устаревший прогноз,
+# обновляя его в фоне (stale-while-revalidate)
+FORECAST_STALE_TTLS = {
+    "current": float(os.getenv("CURRENT_STALE_TTL", "120")),
+    "hourly": float(os.getenv("HOURLY_STALE_TTL", "600")),
+    "daily": float(os.getenv("DAILY_STALE_TTL", "1800")),
+}
+# Сколько секунд после истечения TTL отдавать устаревший прогноз,
+# если Google вернул ошибку (stale-if-error)
+FORECAST_STALE_IF_ERROR_TTL = float(os.getenv("FORECAST_STALE_IF_ERROR_TTL", "21600"))
+
+# Хранить в записях кэша готовые JSON-тела ответов
+RESPONSE_BODY_CACHE = os.getenv("RESPONSE_BODY_CACHE", "true").lower() == "true"
+
+# Формы ответа: как из значения записи кэша получить JSON-тело
+RESPONSE_VIEWS = {
+    "current": lambda value: current_response_adapter.dump_json(value),
+    "hourly-12": lambda value: hourly_list_adapter.dump_json(value[:12]),
+    "tomorrow": lambda value: daily_response_adapter.dump_json(value[1]),
+    "forecast-3days": lambda value: daily_list_adapter.dump_json(value[:3]),
+    "forecast-7days": lambda value: daily_list_adapter.dump_json(value[:7]),
+}
+# Форма ответа для каждого вида прогноза в dashboard и batch
+KIND_VIEWS = {"current": "current", "hourly": "hourly-12", "daily": "forecast-7days"}
+
+POPULARITY_HALF_LIFE = float(os.getenv("POPULARITY_HALF_LIFE", "3600"))
+POPULARITY_MAXSIZE = int(os.getenv("POPULARITY_MAXSIZE", "10000"))
+
+
+class Freshness:
+    """Свежесть данных, из которых собран ответ (для заголовков Age и X-Cache)"""
+    
+    _priority = {"HIT": 0, "MISS": 1, "STALE": 2}
+    
+    def __init__(self):
+        self.status: str | None = None
+        self.age = 0.0
+        self.ttl_remaining: float | None = None
+        self.last_modified: float | None = None
+        # Сколько прогнозов отдано из кэша без обращения к Google
+        self.cached = 0
+    
+    def note(self, entry: CacheEntry, status: str) -> None:
+        if status != "MISS":
+            self.cached += 1
+        if self.status is None or self._priority[status] > self._priority[self.status]:
+            self.status = status
+        self.age = max(self.age, entry.age)
+        ttl = entry.ttl_remaining
+        self.ttl_remaining = ttl if self.ttl_remaining is None else min(self.ttl_remaining, ttl)
+        self.last_modified = (
+            entry.created_at if self.last_modified is None
+            else max(self.last_modified, entry.created_at)
+        )
+
+
+_freshness: ContextVar[Freshness | None] = ContextVar("weather_freshness", default=None)
+
+
+def track_freshness() -> Freshness:
+    """Начать учет свежести для текущего запроса"""
+    freshness = Freshness()
+    _freshness.set(freshness)
+    return freshness
 
 
 class WeatherService:
     
     def __init__(self):
         self.api_key = GOOGLE_API_KEY
+        self._cache = TTLCache(maxsize=FORECAST_CACHE_MAXSIZE)
+        self._flight = SingleFlight("forecast")
+        self._batch_semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        self._background: set[asyncio.Task] = set()
+        self.popularity = DecayingCounter(
+            half_life=POPULARITY_HALF_LIFE,
+            maxsize=POPULARITY_MAXSIZE,
+        )
+    
+    async def close(self) -> None:
+        """Отменить фоновые обновления кэша при остановке сервиса"""
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
     
     def _check_api_key(self):
         """Проверка наличия API ключа"""
@@ -33,7 +148,7 @@ class WeatherService:
         self, 
         latitude: float, 
         longitude: float
-    ) -> dict:
+    ) -> bytes:
         """
         Получить текущие погодные условия
         Эндпоинт: https://weather.googleapis.com/v1/currentConditions:lookup
@@ -42,23 +157,25 @@ class WeatherService:
         url = f"{WEATHER_API_BASE}/currentConditions:lookup"
         
         params = {
-            "key": self.api_key,
             "location.latitude": latitude,
             "location.longitude": longitude,
         }
         headers = {"X-Goog-Api-Key": self.api_key}
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            url, params=params, headers=headers, timeout=get_timeout("current")
+        )
+        response.raise_for_status()
+        return response.content
     
     async def _get_hourly_forecast(
         self, 
         latitude: float, 
         longitude: float,
-        hours: int = 12
-    ) -> dict:
+        hours: int = 12,
+        page_token: str | None = None
+    ) -> bytes:
         """
         Получить почасовой прогноз
         Эндпоинт: https://weather.googleapis.com/v1/forecast/hours:lookup
@@ -67,24 +184,29 @@ class WeatherService:
         url = f"{WEATHER_API_BASE}/forecast/hours:lookup"
         
         params = {
-            "key": self.api_key,
             "location.latitude": latitude,
             "location.longitude": longitude,
             "hours": hours,
+            "pageSize": min(hours, HOURLY_PAGE_SIZE),
         }
+        if page_token:
+            params["pageToken"] = page_token
         headers = {"X-Goog-Api-Key": self.api_key}
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            url, params=params, headers=headers, timeout=get_timeout("hourly")
+        )
+        response.raise_for_status()
+        return response.content
     
     async def _get_daily_forecast(
         self, 
         latitude: float, 
         longitude: float,
-        days: int = 7
-    ) -> dict:
+        days: int = 7,
+        page_token: str | None = None
+    ) -> bytes:
         """
         Получить дневной прогноз
         Эндпоинт: https://weather.googleapis.com/v1/forecast/days:lookup
@@ -93,116 +215,350 @@ class WeatherService:
         url = f"{WEATHER_API_BASE}/forecast/days:lookup"
         
         params = {
-            "key": self.api_key,
             "location.latitude": latitude,
             "location.longitude": longitude,
             "days": days,
+            "pageSize": min(days, DAILY_PAGE_SIZE),
         }
+        if page_token:
+            params["pageToken"] = page_token
         headers = {"X-Goog-Api-Key": self.api_key}
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            url, params=params, headers=headers, timeout=get_timeout("daily")
+        )
+        response.raise_for_status()
+        return response.content
     
-    def _parse_current_weather(self, data: dict) -> CurrentWeatherResponse:
-        current = CurrentWeather(**data)
+    def _parse_current_weather(self, data: bytes) -> CurrentWeatherResponse:
+        current = current_weather_adapter.validate_json(data)
         return map_current(current)
     
-    def _parse_hourly_forecast(self, data: dict, limit: int = 12) -> List[HourlyWeatherResponse]:
-        hourly = HourlyWeather(**data)
-        return [map_hour(hour) for hour in hourly.forecastHours[:limit]]
-    
-    def _parse_daily_forecast(self, data: dict, limit: int = 7) -> List[DailyWeatherResponse]:
-        daily = DailyWeather(**data)
-        return [map_day(day) for day in daily.forecastDays[:limit]]
+    def _cache_key(self, kind: str, coords: dict, horizon: int | None = None) -> tuple:
+        return (
+            kind,
+            round(coords["latitude"], 4),
+            round(coords["longitude"], 4),
+            horizon,
+        )
     
-    async def get_current_weather(self, city: str) -> CurrentWeatherResponse:
-        
-        coords = await get_coordinates(city)
-        
+    async def _fetch_current(self, coords: dict) -> CurrentWeatherResponse:
         data = await self._get_current_conditions(
             latitude=coords["latitude"],
             longitude=coords["longitude"]
         )
+        return self._parse_current_weather(data)
+    
+    async def _fetch_hourly(self, coords: dict, hours: int) -> List[HourlyWeatherResponse]:
+        forecast_hours = []
+        page_token = None
+        while True:
+            data = await self._get_hourly_forecast(
+                latitude=coords["latitude"],
+                longitude=coords["longitude"],
+                hours=hours,
+                page_token=page_token
+            )
+            page = hourly_weather_adapter.validate_json(data)
+            forecast_hours.extend(page.forecastHours)
+            page_token = page.nextPageToken
+            if len(forecast_hours) >= hours or not page_token:
+                break
+        return [map_hour(hour) for hour in forecast_hours[:hours]]
+    
+    async def _fetch_daily(self, coords: dict, days: int) -> List[DailyWeatherResponse]:
+        forecast_days = []
+        page_token = None
+        while True:
+            data = await self._get_daily_forecast(
+                latitude=coords["latitude"],
+                longitude=coords["longitude"],
+                days=days,
+                page_token=page_token
+            )
+            page = daily_weather_adapter.validate_json(data)
+            forecast_days.extend(page.forecastDays)
+            page_token = page.nextPageToken
+            if len(forecast_days) >= days or not page_token:
+                break
+        return [map_day(day) for day in forecast_days[:days]]
+    
+    async def _fetch_and_store(self, key: tuple, kind: str, fetch) -> CacheEntry:
+        value = await fetch()
+        return self._cache.set(
+            key,
+            value,
+            ttl=FORECAST_CACHE_TTLS[kind],
+            stale_ttl=max(FORECAST_STALE_TTLS[kind], FORECAST_STALE_IF_ERROR_TTL),
+        )
+    
+    def _refresh_in_background(self, key: tuple, kind: str, fetch) -> None:
+        task = asyncio.create_task(
+            self._flight.do(key, lambda: self._fetch_and_store(key, kind, fetch))
+        )
+        self._background.add(task)
+        task.add_done_callback(self._on_refresh_done)
+    
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background forecast refresh failed: %s", task.exception())
+    
+    async def _read_through(self, key: tuple, kind: str, fetch):
+        """
+        Прогноз из кэша или из Google.
+        
+        Свежая запись отдается сразу. Устаревшая в пределах FORECAST_STALE_TTLS
+        тоже отдается сразу, а обновление уходит в фон. Если Google вернул
+        ошибку, отдается устаревшая запись, пока она хранится в кэше.
+        """
+        freshness = _freshness.get()
+        self.popularity.hit(key)
+        entry = self._cache.get_entry(key)
+        
+        if entry is not None and not entry.is_stale:
+            status = "HIT"
+        elif entry is not None and entry.stale_for <= FORECAST_STALE_TTLS[kind]:
+            self._refresh_in_background(key, kind, fetch)
+            status = "STALE"
+        else:
+            try:
+                entry = await self._flight.do(
+                    key, lambda: self._fetch_and_store(key, kind, fetch)
+                )
+                status = "MISS"
+            except Exception:
+                if entry is None:
+                    raise
+                status = "STALE"
+        
+        if freshness is not None:
+            freshness.note(entry, status)
+        return entry
+    
+    def _render(self, entry: CacheEntry, view: str) -> CachedBody:
+        """JSON-тело формы view; при RESPONSE_BODY_CACHE сохраняется в записи кэша"""
+        body = entry.bodies.get(view)
+        if body is None:
+            body = CachedBody(RESPONSE_VIEWS[view](entry.value))
+            if RESPONSE_BODY_CACHE:
+                entry.bodies[view] = body
+        return body
+    
+    def _compose(self, fields: dict, parts: dict[str, CachedBody]) -> CachedBody:
+        """Склеить JSON-объект из полей и готовых тел без повторной сериализации"""
+        head = orjson.dumps(fields)
+        chunks = [head[:-1]]
+        separator = b"," if fields else b""
+        for name, part in parts.items():
+            chunks.append(separator + orjson.dumps(name) + b":" + part.body)
+            separator = b","
+        chunks.append(b"}")
+        
+        etag_source = head + b"".join(part.etag.encode() for part in parts.values())
+        return CachedBody(b"".join(chunks), etag=f'"{content_hash(etag_source)}"')
+    
+    def _fetcher(self, key: tuple):
+        kind, latitude, longitude, horizon = key
+        coords = {"latitude": latitude, "longitude": longitude}
+        if kind == "current":
+            return lambda: self._fetch_current(coords)
+        if kind == "hourly":
+            return lambda: self._fetch_hourly(coords, horizon)
+        return lambda: self._fetch_daily(coords, horizon)
+    
+    def location_keys(self, coords: dict) -> List[tuple]:
+        """Ключи кэша, которые заполняют запросы по одной локации"""
+        return [
+            self._cache_key("current", coords),
+            self._cache_key("hourly", coords, HOURLY_FETCH_HOURS),
+            self._cache_key("daily", coords, DAILY_FETCH_DAYS),
+        ]
+    
+    def cache_ttl_remaining(self, key: tuple) -> float | None:
+        entry = self._cache.get_entry(key)
+        return entry.ttl_remaining if entry is not None else None
+    
+    async def prefetch(self, key: tuple) -> None:
+        """Обновить запись кэша заранее, до истечения ее TTL"""
+        kind = key[0]
+        await self._flight.do(
+            key, lambda: self._fetch_and_store(key, kind, self._fetcher(key))
+        )
+    
+    async def _load_current(self, coords: dict) -> CacheEntry:
+        key = self._cache_key("current", coords)
+        return await self._read_through(
+            key, "current", lambda: self._fetch_current(coords)
+        )
+    
+    async def _load_hourly(self, coords: dict, hours: int) -> CacheEntry:
+        fetch_hours = max(hours, HOURLY_FETCH_HOURS)
+        key = self._cache_key("hourly", coords, fetch_hours)
+        return await self._read_through(
+            key, "hourly", lambda: self._fetch_hourly(coords, fetch_hours)
+        )
+    
+    async def _load_daily(self, coords: dict, days: int) -> CacheEntry:
+        fetch_days = max(days, DAILY_FETCH_DAYS)
+        key = self._cache_key("daily", coords, fetch_days)
+        return await self._read_through(
+            key, "daily", lambda: self._fetch_daily(coords, fetch_days)
+        )
+    
+    async def get_current_weather(self, city: str) -> CachedBody:
+        
+        coords = await get_coordinates(city)
         
-        result = self._parse_current_weather(data)
+        entry = await self._load_current(coords)
         
-        await self._save_weather_to_db(city, result, "current")
+        await self._save_weather_to_db(city, entry.value, "current")
         
-        return result
+        return self._render(entry, "current")
     
-    async def get_hourly_12_hours(self, city: str) -> List[HourlyWeatherResponse]:
+    async def get_hourly_12_hours(self, city: str) -> CachedBody:
         
         coords = await get_coordinates(city)
         
-        data = await self._get_hourly_forecast(
-            latitude=coords["latitude"],
-            longitude=coords["longitude"],
-            hours=12
-        )
-        
-        results = self._parse_hourly_forecast(data, limit=12)
+        entry = await self._load_hourly(coords, hours=12)
         
-        for result in results:
-            await self._save_weather_to_db(city, result, "hourly")
+        await self._save_weather_many_to_db(city, entry.value[:12], "hourly")
         
-        return results
+        return self._render(entry, "hourly-12")
     
-    async def get_tomorrow_weather(self, city: str) -> DailyWeatherResponse:
+    async def get_tomorrow_weather(self, city: str) -> CachedBody:
         
         coords = await get_coordinates(city)
         
-        data = await self._get_daily_forecast(
-            latitude=coords["latitude"],
-            longitude=coords["longitude"],
-            days=2  
-        )
-        
-        results = self._parse_daily_forecast(data, limit=2)
+        entry = await self._load_daily(coords, days=2)
         
-        if len(results) < 2:
+        if len(entry.value) < 2:
             raise ValueError("Прогноз на завтра недоступен")
         
-        result = results[1]
-        
-        await self._save_weather_to_db(city, result, "daily")
+        await self._save_weather_to_db(city, entry.value[1], "daily")
         
-        return result
+        return self._render(entry, "tomorrow")
     
-    async def get_3_days_forecast(self, city: str) -> List[DailyWeatherResponse]:
+    async def get_3_days_forecast(self, city: str) -> CachedBody:
        
         coords = await get_coordinates(city)
         
-        data = await self._get_daily_forecast(
-            latitude=coords["latitude"],
-            longitude=coords["longitude"],
-            days=3
-        )
+        entry = await self._load_daily(coords, days=3)
+        
+        await self._save_weather_many_to_db(city, entry.value[:3], "daily")
+        
+        return self._render(entry, "forecast-3days")
+    
+    async def get_7_days_forecast(self, city: str) -> CachedBody:
+        
+        coords = await get_coordinates(city)
         
-        results = self._parse_daily_forecast(data, limit=3)
+        entry = await self._load_daily(coords, days=7)
         
-        for result in results:
-            await self._save_weather_to_db(city, result, "daily")
+        await self._save_weather_many_to_db(city, entry.value[:7], "daily")
         
-        return results
+        return self._render(entry, "forecast-7days")
     
-    async def get_7_days_forecast(self, city: str) -> List[DailyWeatherResponse]:
+    async def get_dashboard(self, city: str) -> CachedBody:
+        """Текущая погода, 12 часов и 7 дней за один запрос"""
         
         coords = await get_coordinates(city)
         
-        data = await self._get_daily_forecast(
-            latitude=coords["latitude"],
-            longitude=coords["longitude"],
-            days=7
+        current, hourly, daily = await asyncio.gather(
+            self._load_current(coords),
+            self._load_hourly(coords, hours=12),
+            self._load_daily(coords, days=7),
+        )
+        
+        await self._save_weather_to_db(city, current.value, "current")
+        await self._save_weather_many_to_db(city, hourly.value[:12], "hourly")
+        await self._save_weather_many_to_db(city, daily.value[:7], "daily")
+        
+        return self._compose(
+            {"city": city},
+            {
+                "current": self._render(current, "current"),
+                "hourly": self._render(hourly, "hourly-12"),
+                "daily": self._render(daily, "forecast-7days"),
+            },
         )
+    
+    async def _get_batch_item(
+        self, 
+        index: int, 
+        location: BatchLocation, 
+        kinds: List[str]
+    ) -> tuple[int, bytes]:
         
-        results = self._parse_daily_forecast(data, limit=7)
+        fields = {"index": index, "city": location.city}
+        parts = {}
         
-        for result in results:
-            await self._save_weather_to_db(city, result, "daily")
+        try:
+            async with self._batch_semaphore:
+                if location.latitude is not None and location.longitude is not None:
+                    coords = {"latitude": location.latitude, "longitude": location.longitude}
+                else:
+                    coords = await get_coordinates(location.city)
+                
+                loaders = {
+                    "current": lambda: self._load_current(coords),
+                    "hourly": lambda: self._load_hourly(coords, hours=12),
+                    "daily": lambda: self._load_daily(coords, days=7),
+                }
+                entries = await asyncio.gather(*(loaders[kind]() for kind in kinds))
+            
+            fields["latitude"] = coords["latitude"]
+            fields["longitude"] = coords["longitude"]
+            
+            history_city = location.city or f"{coords['latitude']},{coords['longitude']}"
+            for kind, entry in zip(kinds, entries):
+                parts[kind] = self._render(entry, KIND_VIEWS[kind])
+                if kind == "current":
+                    await self._save_weather_to_db(history_city, entry.value, kind)
+                elif kind == "hourly":
+                    await self._save_weather_many_to_db(history_city, entry.value[:12], kind)
+                else:
+                    await self._save_weather_many_to_db(history_city, entry.value[:7], kind)
+        except ValueError as e:
+            # Ответ Google не прошел валидацию — подробности только в лог
+            if isinstance(e, ValidationError):
+                logger.warning("Batch item %s failed: %s", index, e)
+                fields["error"] = BATCH_ITEM_ERROR
+            else:
+                fields["error"] = str(e)
+            parts = {}
+        except Exception as e:
+            # Текст ошибок httpx содержит URL запроса к Google — клиенту его не отдаем
+            logger.warning("Batch item %s failed: %s", index, e)
+            fields["error"] = BATCH_ITEM_ERROR
+            parts = {}
         
-        return results
+        fields = {name: value for name, value in fields.items() if value is not None}
+        return index, self._compose(fields, parts).body
+    
+    async def iter_batch(
+        self, 
+        locations: List[BatchLocation], 
+        kinds: List[str]
+    ) -> AsyncIterator[tuple[int, bytes]]:
+        """
+        Погода для списка локаций: пары (индекс, JSON элемента)
+        отдаются по мере готовности
+        """
+        
+        kinds = list(dict.fromkeys(kinds))
+        tasks = [
+            asyncio.create_task(self._get_batch_item(index, location, kinds))
+            for index, location in enumerate(locations)
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
     
     async def _save_weather_to_db(
         self, 
@@ -211,14 +567,28 @@ class WeatherService:
         forecast_type: str
     ) -> None:
         
+        await self._save_weather_many_to_db(city, [weather_data], forecast_type)
+    
+    async def _save_weather_many_to_db(
+        self, 
+        city: str, 
+        weather_list: List[any], 
+        forecast_type: str
+    ) -> None:
+        """Поставить документы в очередь отложенной записи истории"""
+        
         try:
-            weather_dict = weather_data.dict() if hasattr(weather_data, 'dict') else weather_data
-            
-            weather_dict["city"] = city
-            weather_dict["forecast_type"] = forecast_type
+            now = datetime.utcnow()
+            documents = []
+            for weather_data in weather_list:
+                weather_dict = weather_data.model_dump() if hasattr(weather_data, 'model_dump') else dict(weather_data)
+                weather_dict["city"] = city
+                weather_dict["forecast_type"] = forecast_type
+                weather_dict["timestamp"] = now
+                documents.append(weather_dict)
             
-            await weather_repository.save_weather(weather_dict)
+            await weather_write_queue.enqueue(documents)
         except Exception as e:
-            print(f"Ошибка сохранения погоды в БД: {e}")
+            logger.warning("Weather history enqueue failed: %s", e)
 
 weather_service = WeatherService()
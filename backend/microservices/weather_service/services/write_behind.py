@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import time
+from typing import List
+
+from dotenv import load_dotenv
+from prometheus_client import Counter, Gauge, Histogram
+
+from microservices.weather_service.repository.weather import weather_repository
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+WRITE_QUEUE_MAXSIZE = int(os.getenv("WRITE_QUEUE_MAXSIZE", "10000"))
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "200"))
+WRITE_FLUSH_INTERVAL = float(os.getenv("WRITE_FLUSH_INTERVAL", "1.0"))
+# drop_newest — отбросить новый документ, drop_oldest — вытеснить самый старый,
+# block — ждать места в очереди не дольше WRITE_QUEUE_PUT_TIMEOUT
+WRITE_QUEUE_POLICY = os.getenv("WRITE_QUEUE_POLICY", "drop_oldest")
+WRITE_QUEUE_PUT_TIMEOUT = float(os.getenv("WRITE_QUEUE_PUT_TIMEOUT", "0.05"))
+WRITE_DRAIN_TIMEOUT = float(os.getenv("WRITE_DRAIN_TIMEOUT", "10"))
+
+write_queue_depth = Gauge(
+    "weather_write_queue_depth",
+    "Документы погоды, ожидающие записи в MongoDB",
+)
+write_flush_seconds = Histogram(
+    "weather_write_flush_seconds",
+    "Время записи одного пакета в MongoDB",
+)
+write_documents = Counter(
+    "weather_write_documents_total",
+    "Документы погоды, прошедшие через очередь записи",
+    ["result"],
+)
+
+
+class WeatherWriteQueue:
+    """Отложенная пакетная запись истории погоды вне пути ответа"""
+
+    def __init__(
+        self,
+        maxsize: int = WRITE_QUEUE_MAXSIZE,
+        batch_size: int = WRITE_BATCH_SIZE,
+        flush_interval: float = WRITE_FLUSH_INTERVAL,
+        policy: str = WRITE_QUEUE_POLICY,
+    ):
+        if policy not in ("drop_newest", "drop_oldest", "block"):
+            raise ValueError(f"Unknown write queue policy: {policy}")
+
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._closed = False
+        write_queue_depth.set_function(self.depth)
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._closed = False
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = WRITE_DRAIN_TIMEOUT) -> None:
+        self._closed = True
+        if self._worker is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Weather write queue not drained, %s left", self.depth())
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        leftover = self._take_nowait(self.depth())
+        if leftover:
+            await self._flush(leftover)
+
+    async def enqueue(self, documents: List[dict]) -> None:
+        if self._closed:
+            write_documents.labels(result="dropped").inc(len(documents))
+            return
+        if self._worker is None:
+            self.start()
+
+        for document in documents:
+            if self._queue.full():
+                if self.policy == "drop_newest":
+                    write_documents.labels(result="dropped").inc()
+                    continue
+                if self.policy == "drop_oldest":
+                    self._take_nowait(1)
+                    write_documents.labels(result="dropped").inc()
+                else:
+                    try:
+                        await asyncio.wait_for(self._queue.put(document), WRITE_QUEUE_PUT_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        write_documents.labels(result="dropped").inc()
+                    continue
+            self._queue.put_nowait(document)
+
+    def _take_nowait(self, limit: int) -> List[dict]:
+        documents = []
+        while len(documents) < limit:
+            try:
+                documents.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+            self._queue.task_done()
+        return documents
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[dict]) -> None:
+        start_time = time.perf_counter()
+        try:
+            await weather_repository.save_weather_many(batch)
+            write_documents.labels(result="written").inc(len(batch))
+        except Exception as e:
+            write_documents.labels(result="failed").inc(len(batch))
+            logger.warning("Weather batch write failed: %s", e)
+        finally:
+            write_flush_seconds.observe(time.perf_counter() - start_time)
+
+
+weather_write_queue = WeatherWriteQueue()
@@ -298,12 +298,9 @@ async function getCurrentUser() {
     }
 }
 
-async function getCurrentWeather(city) {
-    console.log('Requesting current weather for:', city);
-    console.log('Using token:', accessToken ? accessToken.substring(0, 20) + '...' : 'MISSING');
-
+async function getDashboardWeather(city) {
     const response = await fetch(
-        `${WEATHER_API_BASE_URL}/weather/current?city=${encodeURIComponent(city)}`,
+        `${WEATHER_API_BASE_URL}/weather/dashboard?city=${encodeURIComponent(city)}`,
         {
             headers: {
                 'Authorization': `Bearer ${accessToken}`,
@@ -320,42 +317,6 @@ async function getCurrentWeather(city) {
     return unwrapData(data);
 }
 
-async function getHourlyWeather(city) {
-    const response = await fetch(
-        `${WEATHER_API_BASE_URL}/weather/hourly-12?city=${encodeURIComponent(city)}`,
-        {
-            headers: {
-                'Authorization': `Bearer ${accessToken}`,
-            }
-        }
-    );
-
-    if (!response.ok) {
-        throw new Error('Failed to fetch hourly forecast');
-    }
-
-    const data = await response.json();
-    return unwrapData(data);
-}
-
-async function getWeeklyWeather(city) {
-    const response = await fetch(
-        `${WEATHER_API_BASE_URL}/weather/forecast-7days?city=${encodeURIComponent(city)}`,
-        {
-            headers: {
-                'Authorization': `Bearer ${accessToken}`,
-            }
-        }
-    );
-
-    if (!response.ok) {
-        throw new Error('Failed to fetch weekly forecast');
-    }
-
-    const data = await response.json();
-    return unwrapData(data);
-}
-
 function displayCurrentWeather(data, hourlyData = []) {
     const temp = toNumber(data.temperature);
     const feelsLike = toNumber(data.feels_like ?? data.apparent_temperature);
@@ -476,11 +437,7 @@ async function loadWeather(city) {
     currentCity = city;
 
     try {
-        const [current, hourly, daily] = await Promise.all([
-            getCurrentWeather(city),
-            getHourlyWeather(city),
-            getWeeklyWeather(city)
-        ]);
+        const { current, hourly, daily } = await getDashboardWeather(city);
 
         displayCurrentWeather(current, hourly);
         displayHourlyWeather(hourly);